@@ -152,3 +152,10 @@ def print_args_method(my_function: Callable) -> Callable:
         return my_function(*args, **kwargs)
 
     return internal
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+# since Python 3.10 `ParamSpec` is that standard way, `print_args_method`  #
+# typed with it (plus caching and sampled tracing) is in `decorators.py`   #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
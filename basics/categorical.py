@@ -0,0 +1,120 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `Vehicle.engine_type` (see `3_dataclasses.py`) takes a handful of       #
+#  values ("small", "medium", ...), but every string read from a file or   #
+#  a request is a new object, so a million vehicles hold a million copies  #
+#  of "medium".                                                            #
+#                                                                          #
+#  A `Category[L]` is the shared dictionary of the values of such a field, #
+#  every value is stored once and numbered:                                #
+#                                                                          #
+#  `ENGINE_TYPES: Category[EngineType] = Category(EngineType)`             #
+#  `ENGINE_TYPES("medium")`            -> the one shared "medium"          #
+#  `ENGINE_TYPES.code_of("medium")`    -> 1                                #
+#  `ENGINE_TYPES[1]`                   -> "medium"                         #
+#                                                                          #
+#  `CategoricalVehicle` interns its `engine_type` when created. Each       #
+#  instance keeps a reference to the shared string, the same 8 bytes a     #
+#  code would take, but reading it is a plain slot access and comparing    #
+#  two of them is an identity check. The codes are there for packed        #
+#  storage, an `array("B")` of them is one byte per vehicle.               #
+#                                                                          #
+#  The field is still typed as the `Literal`, built from a `Literal` a     #
+#  category only accepts its values (`closed`), built from nothing it      #
+#  takes any `str` and grows.                                              #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from array import array
+from dataclasses import dataclass
+from typing import Any, ClassVar, Generic, Iterable, Literal, Type, TypeVar, get_args, get_origin
+
+L = TypeVar("L", bound=str)
+
+
+class Category(Generic[L]):
+    __slots__ = ("values", "closed", "_codes")
+
+    def __init__(self, literal: Any = None) -> None:
+        # `Category(EngineType)` for the values of a `Literal`, `Category[str]()` for an open set
+        self.values: list[L] = []
+        self._codes: dict[str, int] = {}
+        self.closed = False
+        if literal is not None:
+            if get_origin(literal) is not Literal:
+                raise TypeError(f"{literal!r} is not a Literal")
+            for value in get_args(literal):
+                self.code_of(value)
+            self.closed = True
+
+    def __call__(self, value: str) -> L:
+        return self.values[self.code_of(value)]
+
+    def code_of(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            if self.closed:
+                raise ValueError(f"{value!r} is not one of {self.values}")
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)  # type: ignore[arg-type]  # an open category is a `Category[str]`
+        return code
+
+    def codes(self, values: Iterable[str]) -> "array[int]":
+        # one byte per value up to 256 of them, an open category can pass that during the call
+        codes = array("B" if len(self.values) <= 256 else "I")
+        interned = map(self.code_of, values)
+        try:
+            codes.extend(interned)
+        except OverflowError:
+            # the value just interned got code 256, `extend` kept the codes before it
+            codes = array("I", codes)
+            codes.append(256)
+            codes.extend(interned)
+        return codes
+
+    def __getitem__(self, code: int) -> L:
+        return self.values[code]
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._codes
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+EngineType = Literal["small", "medium", "large"]
+VehicleName = Literal["car", "motor cycle"]
+
+ENGINE_TYPES: Category[EngineType] = Category(EngineType)
+
+
+@dataclass(frozen=True, slots=True)
+class CategoricalVehicle:
+    engine_type: EngineType
+
+    def __post_init__(self) -> None:
+        # frozen, so the shared value can't be swapped for a copy later on
+        object.__setattr__(self, "engine_type", ENGINE_TYPES(self.engine_type))
+
+
+class Car(CategoricalVehicle):
+    __slots__ = ()  # without it every car gets a `__dict__` back
+    name: ClassVar[VehicleName] = "car"  # a class attribute is already stored once per class
+
+
+class MotorCycle(CategoricalVehicle):
+    __slots__ = ()
+    name: ClassVar[VehicleName] = "motor cycle"
+
+
+class Factory:
+
+    @staticmethod
+    def construct_vehicle(my_class: Type[CategoricalVehicle], engine_type: EngineType) -> CategoricalVehicle:
+        return my_class(engine_type=engine_type)
+
+
+my_car = Factory.construct_vehicle(Car, "medium")
+my_motorcycle = Factory.construct_vehicle(MotorCycle, "small")
+my_parsed = CategoricalVehicle(engine_type="medium,car".split(",")[0])  # type: ignore[arg-type]  # a str from input
+same_object = my_parsed.engine_type is my_car.engine_type  # True
+my_codes = ENGINE_TYPES.codes(["small", "medium", "medium"])  # array('B', [0, 1, 1])
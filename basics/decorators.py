@@ -0,0 +1,202 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  The bonus of `2_functions.py` says there is no standard way to type a   #
+#  decorator, since Python 3.10 there is: `ParamSpec` captures the         #
+#  arguments of the decorated function and `TypeVar` its return value, so  #
+#  `print_args_method` can give back a function the type checker still     #
+#  knows:                                                                  #
+#                                                                          #
+#  `def decorator(function: Callable[P, R]) -> Callable[P, R]: ...`        #
+#                                                                          #
+#  `memoize` caches the results of pure functions (LRU and/or TTL          #
+#  eviction, with hit/miss counters) and `traced` prints one call out of   #
+#  `every` instead of all of them.                                         #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import (
+    Any, Callable, Hashable, Literal, NamedTuple, Optional, ParamSpec, Protocol, TypeVar, Union, cast, overload,
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+R_co = TypeVar("R_co", covariant=True)
+
+_KWARGS_MARK = object()  # keeps `f(1, "a")` and `f(1, a=...)` from sharing a cache entry
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: Optional[int]  # entries dropped to stay under `maxsize`, `None` when it can't be known
+    expirations: int  # entries dropped because they were older than `ttl`
+    maxsize: Optional[int]
+    currsize: int
+
+
+class Memoized(Protocol[P, R_co]):
+    # what `memoize` returns, it can be called exactly like the function it wraps
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R_co: ...
+
+    def cache_info(self) -> CacheInfo: ...
+
+    def cache_clear(self) -> None: ...
+
+
+def _lru(function: Callable[P, R], maxsize: Optional[int]) -> Memoized[P, R]:
+    # without a TTL `functools.lru_cache` (written in C) does the work, we only
+    # replace its `cache_info` with one in our format
+    cached: Any = lru_cache(maxsize=maxsize)(function)
+    functools_info = cached.cache_info
+
+    def cache_info() -> CacheInfo:
+        hits, misses, _, currsize = functools_info()
+        # a cache that was never full never evicted, once full it stays full and we can't
+        # tell evictions from the misses that raised (those are never cached)
+        evictions = 0 if maxsize is None or currsize < maxsize else None
+        return CacheInfo(hits, misses, evictions, 0, maxsize, currsize)
+
+    cached.cache_info = cache_info
+    return cast(Memoized[P, R], cached)
+
+
+def _ttl(function: Callable[P, R], maxsize: Optional[int], ttl: float) -> Memoized[P, R]:
+    cache: OrderedDict[Hashable, tuple[R, float]] = OrderedDict()
+    stats = [0, 0, 0, 0]  # hits, misses, evictions, expirations
+    monotonic = time.monotonic
+    lock = threading.Lock()  # only for writes, as in `generics/cache.py` a hit takes no lock
+
+    @wraps(function)
+    def internal(*args: P.args, **kwargs: P.kwargs) -> R:
+        key: Hashable = args if not kwargs else (*args, _KWARGS_MARK, *kwargs.items())
+        entry = cache.get(key)
+        if entry is not None:
+            if monotonic() < entry[1]:
+                stats[0] += 1
+                if maxsize is not None:
+                    try:
+                        cache.move_to_end(key)  # most recently used go last, evictions start from the front
+                    except KeyError:
+                        pass  # evicted by another thread in the meantime, we still have its value
+                return entry[0]
+            with lock:
+                if cache.get(key) is entry:  # another thread may have dropped or replaced it already
+                    del cache[key]
+                    stats[3] += 1
+
+        stats[1] += 1
+        value = function(*args, **kwargs)
+        with lock:
+            cache[key] = (value, monotonic() + ttl)
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+                stats[2] += 1
+        return value
+
+    def cache_info() -> CacheInfo:
+        hits, misses, evictions, expirations = stats
+        return CacheInfo(hits, misses, evictions, expirations, maxsize, len(cache))
+
+    def cache_clear() -> None:
+        with lock:
+            cache.clear()
+            stats[:] = [0, 0, 0, 0]
+
+    wrapper: Any = internal
+    wrapper.cache_info, wrapper.cache_clear = cache_info, cache_clear
+    return cast(Memoized[P, R], wrapper)
+
+
+@overload
+def memoize(function: Callable[P, R]) -> Memoized[P, R]: ...
+
+
+@overload
+def memoize(
+        *, maxsize: Optional[int] = 128, ttl: Optional[float] = None,
+) -> Callable[[Callable[P, R]], Memoized[P, R]]: ...
+
+
+def memoize(
+        function: Optional[Callable[P, R]] = None,
+        *,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+) -> Union[Memoized[P, R], Callable[[Callable[P, R]], Memoized[P, R]]]:
+    # `maxsize=None` never evicts, `ttl` is in seconds, arguments must be hashable
+    # works as `@memoize` and as `@memoize(maxsize=..., ttl=...)`
+    def decorator(my_function: Callable[P, R]) -> Memoized[P, R]:
+        return _lru(my_function, maxsize) if ttl is None else _ttl(my_function, maxsize, ttl)
+
+    return decorator if function is None else decorator(function)
+
+
+def traced(
+        every: int = 100,
+        sink: Callable[[str], object] = print,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    # reports one call out of `every`, the other calls only pay a counter decrement
+    if every < 1:
+        raise ValueError("every must be at least 1")
+
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        countdown = every
+
+        @wraps(function)
+        def internal(*args: P.args, **kwargs: P.kwargs) -> R:
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                return function(*args, **kwargs)
+            countdown = every
+            start = time.perf_counter_ns()
+            result = function(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            arguments = ", ".join([*map(repr, args), *(f"{name}={value!r}" for name, value in kwargs.items())])
+            sink(f"{function.__qualname__}({arguments}) -> {result!r} in {elapsed} ns")
+            return result
+
+        return internal
+
+    return decorator
+
+
+def print_args_method(my_function: Callable[P, R]) -> Callable[P, R]:
+    # the typed version of the one in `2_functions.py`, it still prints every call
+    return traced(every=1, sink=lambda line: print(my_function, line))(my_function)
+
+
+@memoize(maxsize=1024)
+def multiply(a: int, b: int) -> int:
+    return a * b
+
+
+@overload
+def return_value_2(my_literal: Literal["integer"]) -> int: ...
+
+
+@overload
+def return_value_2(my_literal: Literal["string"]) -> str: ...
+
+
+@memoize(ttl=60.0)
+def return_value_2(my_literal: Literal["integer", "string"]) -> Union[int, str]:
+    if my_literal == "integer":
+        return 25
+    return "25"
+
+
+@traced(every=1000)
+def average_of(*args: int) -> float:
+    return sum(args) / len(args)
+
+
+result = multiply(3, 5)  # int, and the second call is a dictionary lookup
+multiply(3, 5)
+multiply.cache_info()  # CacheInfo(hits=1, misses=1, ...)
+my_string = return_value_2("string")  # still a str, the overloads are kept
+result_string = my_string.replace("2", "3")
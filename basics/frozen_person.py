@@ -0,0 +1,78 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `Person.copy()` (see `3_dataclasses.py`) reads `self.__dict__`, builds  #
+#  a kwargs dict and runs `__init__` again for every clone.                #
+#                                                                          #
+#  If the record can't change after being created (`frozen=True`) a clone  #
+#  doesn't need to copy anything at all, the original can be shared, and   #
+#  we only pay for a new object when a field actually changes              #
+#  (copy on write). `slots=True` (python >= 3.10) also drops the per       #
+#  instance `__dict__`.                                                    #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterable, Literal, Optional, Union
+
+
+class _Keep(Enum):
+    # sentinel for `replace`, `None` is a valid value for `position`
+    KEEP = 0
+
+
+KEEP: Literal[_Keep.KEEP] = _Keep.KEEP
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenPerson:
+    name: str
+    age: int
+    position: Optional[str]
+    weight: float
+
+    def say_hi_to(self, other: 'FrozenPerson') -> None:
+        print(f"Hi {other.name}, I'm {self.name}")
+
+    def copy(self) -> 'FrozenPerson':
+        # nobody can modify it, so the clone can be the very same object
+        return self
+
+    def replace(
+            self,
+            *,
+            name: Union[str, _Keep] = KEEP,
+            age: Union[int, _Keep] = KEEP,
+            position: Union[Optional[str], _Keep] = KEEP,
+            weight: Union[float, _Keep] = KEEP,
+    ) -> 'FrozenPerson':
+        # a new object only for the clones that change something
+        if name is KEEP and age is KEEP and position is KEEP and weight is KEEP:
+            return self
+
+        clone = object.__new__(FrozenPerson)
+        # writing through the slot descriptors skips the frozen `__setattr__`
+        _set_name(clone, self.name if name is KEEP else name)
+        _set_age(clone, self.age if age is KEEP else age)
+        _set_position(clone, self.position if position is KEEP else position)
+        _set_weight(clone, self.weight if weight is KEEP else weight)
+        return clone
+
+
+_set_name: Callable[[FrozenPerson, str], None] = vars(FrozenPerson)["name"].__set__
+_set_age: Callable[[FrozenPerson, int], None] = vars(FrozenPerson)["age"].__set__
+_set_position: Callable[[FrozenPerson, Optional[str]], None] = vars(FrozenPerson)["position"].__set__
+_set_weight: Callable[[FrozenPerson, float], None] = vars(FrozenPerson)["weight"].__set__
+
+
+def copy_many(people: Iterable[FrozenPerson]) -> list[FrozenPerson]:
+    # structural sharing: the batch is a new list pointing to the same records
+    return list(people)
+
+
+person_a = FrozenPerson(name="Charles", age=21, position=None, weight=73.2)
+person_b = FrozenPerson(name="Xavier", age=35, position="professor", weight=73.2)
+
+person_a_clone = person_a.copy()  # same object, no copy at all
+person_a_older = person_a.replace(age=22)  # a new object, only because `age` changed
+
+my_people = copy_many([person_a, person_b])
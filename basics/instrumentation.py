@@ -0,0 +1,322 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Where does the time go? `@timed` and `measure(...)` record, per         #
+#  function, how many calls there were, how long they took in total and a  #
+#  histogram of their durations, using `time.perf_counter_ns`.             #
+#                                                                          #
+#  Calls are kept in a call tree per thread, so the hot path never touches #
+#  shared state and allocates nothing once a call site has been seen.      #
+#  Everything is off until `enable()`, a disabled `@timed` function only   #
+#  checks a global flag before calling the real one. With the environment  #
+#  variable `INSTRUMENTATION=0` `@timed` doesn't even wrap the function.   #
+#                                                                          #
+#  `enable()`                                                              #
+#  `instrument(ListOfNames, "get_names")`  wraps methods of a class        #
+#  `print(REGISTRY.report())`              flat table per function        #
+#  `REGISTRY.export_speedscope(path)`      open it on speedscope.app       #
+#  `REGISTRY.export_collapsed(path)`       for `flamegraph.pl`             #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import inspect
+import json
+import os
+import threading
+from functools import wraps
+from pathlib import Path
+from time import perf_counter_ns
+from types import TracebackType
+from typing import Any, Callable, Iterator, Optional, ParamSpec, Type, TypeVar, Union, overload
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_BUCKETS = 64  # bucket `n` counts the calls that took [2 ** (n - 1), 2 ** n) nanoseconds
+
+_enabled = False
+
+# `INSTRUMENTATION=0` makes `@timed` hand back the function untouched, not even the flag check is left
+_AVAILABLE = os.environ.get("INSTRUMENTATION", "1") != "0"
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class Stats:
+    __slots__ = ("count", "total_ns", "max_ns", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * _BUCKETS
+
+    def record(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.histogram[elapsed_ns.bit_length()] += 1
+
+    def merge(self, other: "Stats") -> None:
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+
+    def percentile(self, percent: float) -> int:
+        # upper bound of the bucket the percentile falls in, good to a factor of 2
+        wanted = self.count * percent / 100
+        seen = 0
+        for bucket, calls in enumerate(self.histogram):
+            seen += calls
+            if calls and seen >= wanted:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+
+class _Node:
+    # one call site in the call tree: a function *and* the chain of calls that led to it
+    __slots__ = ("name", "parent", "children", "stats")
+
+    def __init__(self, name: str, parent: Optional["_Node"]) -> None:
+        self.name = name
+        self.parent = parent
+        self.children: dict[str, _Node] = {}
+        self.stats = Stats()
+
+    def walk(self, stack: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], "_Node"]]:
+        # other threads may add children while we report, so we go over a copy
+        for child in list(self.children.values()):
+            child_stack = (*stack, child.name)
+            yield child_stack, child
+            yield from child.walk(child_stack)
+
+    def self_ns(self) -> int:
+        return self.stats.total_ns - sum(child.stats.total_ns for child in list(self.children.values()))
+
+
+class _ThreadState(threading.local):
+
+    def __init__(self) -> None:
+        self.root = self.current = _Node("<root>", None)
+        self.starts: list[int] = []
+        REGISTRY.add_root(self.root)
+
+
+class Registry:
+
+    def __init__(self) -> None:
+        self._roots: list[_Node] = []
+        self._lock = threading.Lock()
+
+    def add_root(self, root: _Node) -> None:
+        with self._lock:
+            self._roots.append(root)
+
+    def reset(self) -> None:
+        with self._lock:
+            for root in self._roots:
+                root.children.clear()
+
+    def functions(self) -> dict[str, Stats]:
+        # flat statistics per name, every call is counted but the time of a recursive
+        # call is already part of the outermost one, so it isn't added again
+        flat: dict[str, Stats] = {}
+        with self._lock:
+            roots = list(self._roots)
+        for root in roots:
+            for stack, node in root.walk():
+                stats = flat.setdefault(node.name, Stats())
+                total_ns = stats.total_ns
+                stats.merge(node.stats)
+                if node.name in stack[:-1]:
+                    stats.total_ns = total_ns
+        return flat
+
+    def report(self) -> str:
+        rows = [("function", "calls", "total ms", "mean us", "p50 us", "p99 us", "max us")]
+        functions = sorted(self.functions().items(), key=lambda item: item[1].total_ns, reverse=True)
+        for name, stats in functions:
+            rows.append((
+                name,
+                str(stats.count),
+                f"{stats.total_ns / 1e6:.3f}",
+                f"{stats.total_ns / stats.count / 1e3:.3f}",
+                f"{stats.percentile(50) / 1e3:.3f}",
+                f"{stats.percentile(99) / 1e3:.3f}",
+                f"{stats.max_ns / 1e3:.3f}",
+            ))
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) if column == 0 else cell.rjust(width)
+                      for column, (cell, width) in enumerate(zip(row, widths)))
+            for row in rows
+        )
+
+    def _stacks(self) -> Iterator[tuple[tuple[str, ...], int]]:
+        # every call stack with the time spent in its last function but not in its callees
+        with self._lock:
+            roots = list(self._roots)
+        for root in roots:
+            for stack, node in root.walk():
+                yield stack, node.self_ns()
+
+    def export_collapsed(self, path: Union[str, Path]) -> None:
+        # "outer;inner 1234" lines, the format `flamegraph.pl` reads (speedscope reads it too)
+        lines = [f"{';'.join(stack)} {self_ns}" for stack, self_ns in self._stacks() if self_ns > 0]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+    def export_speedscope(self, path: Union[str, Path], name: str = "instrumentation") -> None:
+        frames: dict[str, int] = {}
+        samples: list[list[int]] = []
+        weights: list[int] = []
+        for stack, self_ns in self._stacks():
+            if self_ns > 0:
+                samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+                weights.append(self_ns)
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "basics.instrumentation",
+        }
+        Path(path).write_text(json.dumps(document))
+
+
+REGISTRY = Registry()
+_state = _ThreadState()
+
+
+def _enter(name: str) -> None:
+    state = _state
+    node = state.current.children.get(name)
+    if node is None:
+        node = state.current.children[name] = _Node(name, state.current)
+    state.current = node
+    state.starts.append(perf_counter_ns())
+
+
+def _exit() -> None:
+    end = perf_counter_ns()
+    state = _state
+    node = state.current
+    node.stats.record(end - state.starts.pop())
+    state.current = node.parent or state.root
+
+
+class measure:
+    # `with measure("loading"): ...`, reusable and nestable
+
+    __slots__ = ("name", "_active")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._active: list[bool] = []  # whether each nested `__enter__` was recorded
+
+    def __enter__(self) -> None:
+        self._active.append(_enabled)
+        if _enabled:
+            _enter(self.name)
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType],
+    ) -> None:
+        if self._active.pop():
+            _exit()
+
+
+@overload
+def timed(function: Callable[P, R]) -> Callable[P, R]: ...
+
+
+@overload
+def timed(*, name: Optional[str] = None) -> Callable[[Callable[P, R]], Callable[P, R]]: ...
+
+
+def timed(
+        function: Optional[Callable[P, R]] = None,
+        *,
+        name: Optional[str] = None,
+) -> Union[Callable[P, R], Callable[[Callable[P, R]], Callable[P, R]]]:
+    def decorator(my_function: Callable[P, R]) -> Callable[P, R]:
+        if not _AVAILABLE:
+            return my_function
+        label = name or f"{my_function.__module__}.{my_function.__qualname__}"
+
+        @wraps(my_function)
+        def internal(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _enabled:
+                return my_function(*args, **kwargs)
+            _enter(label)
+            try:
+                return my_function(*args, **kwargs)
+            finally:
+                _exit()
+
+        return internal
+
+    return decorator if function is None else decorator(function)
+
+
+def instrument(cls: type, *method_names: str) -> None:
+    # wraps methods of a class we can't (or don't want to) decorate in its source,
+    # inherited methods are wrapped on `cls` itself and the base class is left alone,
+    # with `INSTRUMENTATION=0` there is nothing to wrap them with and the class is left as is
+    if not _AVAILABLE:
+        return
+    for method_name in method_names:
+        attribute = inspect.getattr_static(cls, method_name)
+        label = f"{cls.__qualname__}.{method_name}"
+        if isinstance(attribute, (staticmethod, classmethod)):
+            wrapped: Any = type(attribute)(timed(name=label)(attribute.__func__))
+        else:
+            wrapped = timed(name=label)(attribute)
+        setattr(cls, method_name, wrapped)
+
+
+def uninstrument(cls: type, *method_names: str) -> None:
+    if not _AVAILABLE:
+        return  # `instrument` didn't touch the class
+    for method_name in method_names:
+        attribute = vars(cls)[method_name]
+        wrapper: Any = attribute.__func__ if isinstance(attribute, (staticmethod, classmethod)) else attribute
+        original = type(attribute)(wrapper.__wrapped__) if wrapper is not attribute else wrapper.__wrapped__
+        delattr(cls, method_name)
+        inherited = inspect.getattr_static(cls, method_name, None)
+        if getattr(inherited, "__func__", inherited) is not getattr(original, "__func__", original):
+            setattr(cls, method_name, original)
+
+
+@timed
+def fibonacci(number: int) -> int:
+    return number if number < 2 else fibonacci(number - 1) + fibonacci(number - 2)
+
+
+if __name__ == '__main__':
+    enable()
+    with measure("fibonacci(15)"):
+        fibonacci(15)
+    print(REGISTRY.report())
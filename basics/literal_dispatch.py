@@ -0,0 +1,141 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `return_value` (see `2_functions.py`) and `Concessionary.__init__` (see #
+#  `protocols/2_custom.py`) branch on a `Literal` with if/elif, one more   #
+#  comparison for every value, and a value that isn't handled silently     #
+#  falls through to `None`.                                                #
+#                                                                          #
+#  `literal_dispatch` turns the branches into a jump table, one handler    #
+#  per literal value and a single dict lookup whatever their number. The   #
+#  handlers are declared as a TypedDict with one key per literal value:    #
+#                                                                          #
+#  `class KindHandlers(TypedDict):`                                        #
+#  `    integer: Callable[[], int]`     ... a key for every value of Kind  #
+#  `table: LiteralDispatch[Kind, [], int] = literal_dispatch(`             #
+#  `    Kind, KindHandlers(integer=..., ...))`                             #
+#  `table("integer")`                  -> calls the "integer" handler      #
+#  `table.handlers["integer"]()`       -> the same, without the overhead   #
+#                                         of a Python level `__call__`     #
+#                                                                          #
+#  The type checker rejects                                                #
+#  - a `KindHandlers` with a key missing or a key too many                 #
+#  - calling the table with a value that isn't in `Kind`                   #
+#  - a table without an annotation, nothing else tells it what `Kind` is   #
+#                                                                          #
+#  It can't tell whether the keys of `KindHandlers` are the values of      #
+#  `Kind`, nor whether the handlers return what the annotation says. The   #
+#  first is checked at runtime:                                            #
+#  - a value of the `Literal` without a handler (or a handler for a value  #
+#    that isn't in it) raises `TypeError` as soon as the table is built    #
+#  - a value that isn't in it raises `UnknownLiteral` when called          #
+#                                                                          #
+#  Overloads on the function that uses the table give every value its own  #
+#  return type, see `return_value_3`.                                      #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from typing import (
+    Any, Callable, Generic, Literal, Mapping, ParamSpec, TypedDict, TypeVar, Union, get_args, get_origin, overload,
+)
+
+L = TypeVar("L", bound=str)
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class UnknownLiteral(LookupError):
+    ...
+
+
+def literal_values(literal: Any) -> tuple[Any, ...]:
+    # `Literal["a", Literal["b", "c"]]` is flattened by `typing` already
+    if get_origin(literal) is not Literal:
+        raise TypeError(f"{literal!r} is not a Literal")
+    return get_args(literal)
+
+
+class _Handlers(dict[Any, Any]):
+    __slots__ = ("expected",)
+    expected: tuple[Any, ...]
+
+    def __missing__(self, value: object) -> Any:
+        # only reached on a miss, a hit is the plain C lookup of `dict`
+        raise UnknownLiteral(f"{value!r} is not one of {self.expected}")
+
+
+class LiteralDispatch(Generic[L, P, R]):
+    __slots__ = ("values", "handlers")
+
+    def __init__(self, literal: Any, handlers: Mapping[str, object]) -> None:
+        # `handlers` is meant to be a TypedDict, which is only a `Mapping[str, object]` to the
+        # type checker, so `L`, `P` and `R` come from the annotation of the table
+        self.values: tuple[L, ...] = literal_values(literal)
+        missing = [value for value in self.values if value not in handlers]
+        unexpected = [value for value in handlers if value not in self.values]
+        if missing or unexpected:
+            raise TypeError(
+                f"the handlers of {literal!r} don't match its values, "
+                f"missing: {missing}, not in the Literal: {unexpected}"
+            )
+        table = _Handlers(handlers)
+        table.expected = self.values
+        self.handlers: Mapping[L, Callable[P, R]] = table  # read only for the type checker
+
+    def __call__(self, value: L, /, *args: P.args, **kwargs: P.kwargs) -> R:
+        return self.handlers[value](*args, **kwargs)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.handlers
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.values))})"
+
+
+def literal_dispatch(literal: Any, handlers: Mapping[str, object]) -> LiteralDispatch[L, P, R]:
+    return LiteralDispatch(literal, handlers)
+
+
+ReturnKind = Literal["integer", "string"]
+
+
+class ReturnHandlers(TypedDict):
+    integer: Callable[[], int]
+    string: Callable[[], str]
+
+
+_return_values: LiteralDispatch[ReturnKind, [], Union[int, str]] = literal_dispatch(ReturnKind, ReturnHandlers(
+    integer=lambda: 25,
+    string=lambda: "25",
+))
+
+
+@overload
+def return_value_3(my_literal: Literal["integer"]) -> int: ...
+
+
+@overload
+def return_value_3(my_literal: Literal["string"]) -> str: ...
+
+
+def return_value_3(my_literal: ReturnKind) -> Union[int, str]:
+    return _return_values.handlers[my_literal]()
+
+
+my_number = return_value_3("integer")
+my_string = return_value_3("string").replace("2", "3")  # a str, no Union to narrow
+
+VehicleType = Literal["car", "motorcycle"]
+
+
+class VehicleHandlers(TypedDict):
+    car: Callable[[str], str]
+    motorcycle: Callable[[str], str]
+
+
+# as `Concessionary.__init__` with the factories as handlers, extra arguments reach them too
+_vehicle_names: LiteralDispatch[VehicleType, [str], str] = literal_dispatch(VehicleType, VehicleHandlers(
+    car=lambda colour: f"{colour} car",
+    motorcycle=lambda colour: f"{colour} motor cycle",
+))
+my_vehicle = _vehicle_names("car", "red")  # "red car"
+# VehicleHandlers(car=lambda colour: colour)  # type error, the "motorcycle" handler is missing
+# _vehicle_names("boat", "red")  # type error, "boat" isn't a `VehicleType`
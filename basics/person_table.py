@@ -0,0 +1,226 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Every `Person` (see `3_dataclasses.py`) is a full object with its own   #
+#  `__dict__`. When we hold a lot of them it is cheaper to keep one column #
+#  per field (struct of arrays) and hand out small row views instead:      #
+#                                                                          #
+#  - `name`      codes into a table of interned strings                    #
+#  - `age`       array('q')                                                #
+#  - `position`  codes into a table of interned strings + a null bitmap    #
+#  - `weight`    array('d')                                                #
+#                                                                          #
+#  Row views don't inherit from `Person`, instead both of them follow the  #
+#  `PersonProtocol` structure so they can be used in the same places.      #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import operator
+from array import array
+from itertools import compress, repeat
+from typing import Any, Callable, Iterable, Iterator, Literal, Optional, Protocol
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # NumPy is optional, filters fall back to C level iteration
+    np = None  # type: ignore[assignment, unused-ignore]
+
+
+class PersonProtocol(Protocol):
+    name: str
+    age: int
+    position: Optional[str]
+    weight: float
+
+    def copy(self) -> "PersonProtocol": ...
+
+
+NumericColumn = Literal["age", "weight"]
+Comparison = Literal["<", "<=", "==", "!=", ">=", ">"]
+
+COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+
+class StringPool:
+    # every distinct string is stored once, columns only keep its code
+    __slots__ = ("values", "codes")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def code_of(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class PersonTable:
+    __slots__ = ("_strings", "_names", "_ages", "_positions", "_position_nulls", "_weights")
+
+    def __init__(self, people: Iterable[PersonProtocol] = ()) -> None:
+        self._strings = StringPool()
+        self._names = array("I")
+        self._ages = array("q")
+        self._positions = array("I")
+        self._position_nulls = bytearray()  # bit `i` is set when row `i` has no position
+        self._weights = array("d")
+        self.extend(people)
+
+    def add(self, name: str, age: int, position: Optional[str], weight: float) -> "PersonRow":
+        index = len(self._ages)
+        if index % 8 == 0:
+            self._position_nulls.append(0)
+        self._names.append(self._strings.code_of(name))
+        self._ages.append(age)
+        self._weights.append(weight)
+        self._positions.append(0)
+        self._set_position(index, position)
+        return PersonRow(self, index)
+
+    def append(self, person: PersonProtocol) -> "PersonRow":
+        return self.add(person.name, person.age, person.position, person.weight)
+
+    def extend(self, people: Iterable[PersonProtocol]) -> None:
+        for person in people:
+            self.append(person)
+
+    def __len__(self) -> int:
+        return len(self._ages)
+
+    def __getitem__(self, index: int) -> "PersonRow":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return PersonRow(self, index)
+
+    def __iter__(self) -> Iterator["PersonRow"]:
+        return (PersonRow(self, index) for index in range(len(self)))
+
+    def rows(self, indices: Iterable[int]) -> list["PersonRow"]:
+        return [PersonRow(self, index) for index in indices]
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #  vectorized filters and aggregates over the numeric columns           #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def where(self, column: NumericColumn, comparison: Comparison, value: float) -> list[int]:
+        # i.e. `table.where("age", ">", 30)` gives the indices of the rows with age > 30
+        values = self._column(column)
+        compare = COMPARISONS[comparison]
+        if np is not None:
+            # `frombuffer` reads the array in place, nothing is copied
+            mask = compare(np.frombuffer(values, dtype=values.typecode), value)
+            return np.flatnonzero(mask).tolist()  # type: ignore[no-any-return, unused-ignore]
+        return list(compress(range(len(values)), map(compare, values, repeat(value))))
+
+    def sum(self, column: NumericColumn) -> float:
+        values = self._column(column)
+        if np is not None and len(values):
+            return float(np.frombuffer(values, dtype=values.typecode).sum())
+        return sum(values)
+
+    def mean(self, column: NumericColumn) -> float:
+        if not len(self):
+            raise ValueError("mean of an empty table")
+        return self.sum(column) / len(self)
+
+    def _column(self, column: NumericColumn) -> "array[int] | array[float]":
+        return self._ages if column == "age" else self._weights
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #  cell access used by the row views                                    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _get_position(self, index: int) -> Optional[str]:
+        if self._position_nulls[index >> 3] & (1 << (index & 7)):
+            return None
+        return self._strings.values[self._positions[index]]
+
+    def _set_position(self, index: int, position: Optional[str]) -> None:
+        if position is None:
+            self._position_nulls[index >> 3] |= 1 << (index & 7)
+        else:
+            self._position_nulls[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+            self._positions[index] = self._strings.code_of(position)
+
+
+class PersonRow:
+    # a row is just a table and an index, the values stay in the columns
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: PersonTable, index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._table._strings.values[self._table._names[self._index]]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._table._names[self._index] = self._table._strings.code_of(value)
+
+    @property
+    def age(self) -> int:
+        return self._table._ages[self._index]
+
+    @age.setter
+    def age(self, value: int) -> None:
+        self._table._ages[self._index] = value
+
+    @property
+    def position(self) -> Optional[str]:
+        return self._table._get_position(self._index)
+
+    @position.setter
+    def position(self, value: Optional[str]) -> None:
+        self._table._set_position(self._index, value)
+
+    @property
+    def weight(self) -> float:
+        return self._table._weights[self._index]
+
+    @weight.setter
+    def weight(self, value: float) -> None:
+        self._table._weights[self._index] = value
+
+    def say_hi_to(self, other: PersonProtocol) -> None:
+        print(f"Hi {other.name}, I'm {self.name}")
+
+    def copy(self) -> "PersonRow":
+        # the clone is a new row of the same table
+        return self._table.append(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"PersonRow(name={self.name!r}, age={self.age!r}, "
+            f"position={self.position!r}, weight={self.weight!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersonRow):
+            return NotImplemented
+        return (self.name, self.age, self.position, self.weight) == (
+            other.name, other.age, other.position, other.weight
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+my_people = PersonTable()
+person_a = my_people.add(name="Charles", age=21, position=None, weight=73.2)
+person_b = my_people.add(name="Xavier", age=35, position="professor", weight=73.2)
+
+person_a_clone = person_a.copy()  # a new row, filled from the columns of `person_a`
+
+older_than_30 = my_people.rows(my_people.where("age", ">", 30))
+mean_weight = my_people.mean("weight")
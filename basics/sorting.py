@@ -0,0 +1,145 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `sort_keys` and `sort_kwargs` (see `2_functions.py`) sort every value   #
+#  even when we only need the first few, and `sort_keys` actually returns  #
+#  the values. Here keys and values get their own, correctly named,        #
+#  functions, plus three ways of not sorting everything up front:          #
+#                                                                          #
+#  `top_k(values, 10)`          heap of 10 items, O(n log k)               #
+#  `iter_sorted(values)`        heapify once, pop items as they are asked  #
+#  `external_sorted(values)`    sorted runs spilled to temporary files and #
+#                               merged back, for inputs bigger than memory #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import heapq
+import pickle
+import tempfile
+from itertools import chain, count, islice
+from typing import IO, Any, Callable, Iterable, Iterator, Mapping, Optional, Protocol, TypeVar
+
+
+class SupportsLessThan(Protocol):
+
+    def __lt__(self, other: Any) -> bool: ...
+
+
+K = TypeVar("K", bound=SupportsLessThan)
+V = TypeVar("V", bound=SupportsLessThan)
+T = TypeVar("T")
+
+Key = Optional[Callable[[T], SupportsLessThan]]
+
+_CHUNK = 1024  # items pickled together when spilling a run, one `dump` per item is slow
+
+
+def sorted_keys(my_dict: Mapping[K, Any]) -> list[K]:
+    return sorted(my_dict)
+
+
+def sorted_values(my_dict: Mapping[Any, V]) -> list[V]:
+    return sorted(my_dict.values())
+
+
+def top_k(values: Iterable[T], k: int, *, key: Key[T] = None, largest: bool = True) -> list[T]:
+    # `heapq.nlargest` keeps a heap of `k` items instead of sorting all of them
+    if k <= 0:
+        return []
+    if largest:
+        return heapq.nlargest(k, values, key=key)  # type: ignore[arg-type]
+    return heapq.nsmallest(k, values, key=key)  # type: ignore[arg-type]
+
+
+class _Reversed:
+    # flips the comparison so a min-heap gives the largest item first
+    __slots__ = ("value",)
+
+    def __init__(self, value: SupportsLessThan) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        # tuples compare items with `==` first, without it ties never reach the counter
+        return isinstance(other, _Reversed) and not (self.value < other.value or other.value < self.value)
+
+
+def iter_sorted(values: Iterable[T], *, key: Key[T] = None, reverse: bool = False) -> Iterator[T]:
+    # O(n) to build the heap, then O(log n) per item we actually take
+    if key is None and not reverse:
+        items = list(values)  # plain values, equal ones can't be told apart anyway
+        heapq.heapify(items)  # type: ignore[type-var]
+        while items:
+            yield heapq.heappop(items)  # type: ignore[type-var]
+        return
+
+    def sort_key(value: T) -> SupportsLessThan:
+        result: Any = value if key is None else key(value)
+        return _Reversed(result) if reverse else result
+
+    # the counter keeps items with equal keys in their original order, as `sorted` does
+    heap = [(sort_key(value), index, value) for index, value in zip(count(), values)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def _spill(run: list[T]) -> IO[bytes]:
+    file = tempfile.TemporaryFile()  # deleted as soon as it is closed
+    for start in range(0, len(run), _CHUNK):
+        pickle.dump(run[start:start + _CHUNK], file, protocol=pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_run(file: IO[bytes]) -> Iterator[T]:
+    while True:
+        try:
+            chunk: list[T] = pickle.load(file)
+        except EOFError:
+            return
+        yield from chunk
+
+
+def external_sorted(
+        values: Iterable[T],
+        *,
+        key: Key[T] = None,
+        reverse: bool = False,
+        max_in_memory: int = 100_000,
+) -> Iterator[T]:
+    # at most `max_in_memory` items are sorted in memory at once, bigger inputs are
+    # written to disk as sorted runs and merged lazily, so items must be picklable
+    if max_in_memory < 1:
+        raise ValueError("max_in_memory must be at least 1")
+    return _external_sorted(iter(values), key, reverse, max_in_memory)  # raises now, not at the first item
+
+
+def _external_sorted(iterator: Iterator[T], key: Key[T], reverse: bool, max_in_memory: int) -> Iterator[T]:
+    run = list(islice(iterator, max_in_memory + 1))  # one more tells us whether it all fits
+    if len(run) <= max_in_memory:
+        run.sort(key=key, reverse=reverse)
+        yield from run  # no files needed
+        return
+    iterator = chain([run.pop()], iterator)
+
+    files: list[IO[bytes]] = []
+    try:
+        while run:
+            run.sort(key=key, reverse=reverse)
+            files.append(_spill(run))
+            run = list(islice(iterator, max_in_memory))
+        runs: list[Iterator[T]] = [_read_run(file) for file in files]
+        yield from heapq.merge(*runs, key=key, reverse=reverse)  # type: ignore[arg-type]
+    finally:
+        for file in files:
+            file.close()
+
+
+my_dict = {"key_2": 3, "key_3": 1, "key_1": 2}
+
+my_keys = sorted_keys(my_dict)  # ["key_1", "key_2", "key_3"]
+my_values = sorted_values(my_dict)  # [1, 2, 3]
+my_top = top_k(my_dict, 2, key=my_dict.__getitem__)  # keys of the 2 biggest values
+my_first = next(iter_sorted(my_dict.values()))
+my_sorted = list(external_sorted(range(10, 0, -1), max_in_memory=4))  # 3 runs on disk
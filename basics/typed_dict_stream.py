@@ -0,0 +1,231 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Streaming validation of big NDJSON (one JSON document per line) or      #
+#  JSON array files against a TypedDict schema such as `MyUserDict`:       #
+#                                                                          #
+#  `for user in validate_stream("users.ndjson", MyUserDict,                #
+#                               on_invalid=rejected.append): ...`          #
+#                                                                          #
+#  Valid records are yielded as they are read, invalid ones are handed to  #
+#  `on_invalid` with their position and the path of every key that failed  #
+#  (i.e. `("invalid_key", "unexpected key")` or                            #
+#  `("age", "expected int, got float")`).                                  #
+#                                                                          #
+#  NDJSON files are memory mapped and split in chunks that end on a line   #
+#  break, those chunks are validated by a process pool with a bounded      #
+#  number of chunks in flight, so memory stays constant whatever the size  #
+#  of the file. A JSON array can't be split without parsing it, so it is   #
+#  decoded incrementally from a buffered reader in the calling process.    #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import json
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterator, Literal, NamedTuple, Optional, Type, TypeVar, Union
+
+from basics.typed_dict_validator import ValidationIssue, validator_for
+
+TD = TypeVar("TD")
+
+StrPath = Union[str, "os.PathLike[str]"]
+FileFormat = Literal["auto", "ndjson", "json"]
+
+
+class InvalidRecord(NamedTuple):
+    position: int  # line number (from 1) for NDJSON, index in the array for JSON
+    issues: list[ValidationIssue]
+
+
+InvalidHandler = Callable[[InvalidRecord], None]
+
+
+def _ignore(record: InvalidRecord) -> None:
+    ...
+
+
+def validate_stream(
+        path: StrPath,
+        schema: Type[TD],
+        *,
+        on_invalid: InvalidHandler = _ignore,
+        file_format: FileFormat = "auto",
+        workers: Optional[int] = None,
+        chunk_size: int = 1 << 20,
+) -> Iterator[TD]:
+    if file_format == "auto":
+        file_format = "json" if _first_byte(path) == b"[" else "ndjson"
+    if file_format == "json":
+        return _validate_json_array(path, schema, on_invalid)
+    return _validate_ndjson(path, schema, on_invalid, workers or os.cpu_count() or 1, chunk_size)
+
+
+def _first_byte(path: StrPath) -> bytes:
+    with open(path, "rb") as file:
+        while True:
+            block = file.read(4096)
+            if not block:
+                return b""
+            stripped = block.lstrip()
+            if stripped:
+                return stripped[:1]
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#  NDJSON                                                                  #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+
+ChunkResult = tuple[list[Any], list[tuple[int, list[ValidationIssue]]], int]
+
+
+def _chunk_bounds(path: StrPath, chunk_size: int) -> Iterator[tuple[int, int]]:
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            while start < size:
+                end = mapped.find(b"\n", min(start + chunk_size, size - 1))
+                end = size if end == -1 else end + 1
+                yield start, end
+                start = end
+
+
+def _validate_chunk(path: StrPath, start: int, end: int, schema: Type[Any]) -> ChunkResult:
+    # runs inside the workers, line numbers are relative to the chunk
+    validator = validator_for(schema)
+    valid: list[Any] = []
+    invalid: list[tuple[int, list[ValidationIssue]]] = []
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # decoding the whole chunk at once is cheaper than letting `json.loads` do it per line,
+        # `str.splitlines` would also split on characters JSON allows inside strings
+        lines = mapped[start:end].decode("utf-8").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    for line_number, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            invalid.append((line_number, [("", f"invalid JSON: {error}")]))
+            continue
+        issues = validator.errors(record)
+        if issues:
+            invalid.append((line_number, issues))
+        else:
+            valid.append(record)
+    return valid, invalid, len(lines)
+
+
+def _validate_ndjson(path: StrPath, schema: Type[TD], on_invalid: InvalidHandler, workers: int, chunk_size: int) -> Iterator[TD]:
+    first_line = 1
+
+    def emit(result: ChunkResult) -> Iterator[TD]:
+        nonlocal first_line
+        valid, invalid, line_count = result
+        for line_number, issues in invalid:
+            on_invalid(InvalidRecord(first_line + line_number, issues))
+        first_line += line_count
+        yield from valid
+
+    if workers == 1:
+        for start, end in _chunk_bounds(path, chunk_size):
+            yield from emit(_validate_chunk(path, start, end, schema))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # twice as many chunks as workers keeps everyone busy without reading ahead the whole file
+        in_flight: deque[Future[ChunkResult]] = deque()
+        for start, end in _chunk_bounds(path, chunk_size):
+            in_flight.append(executor.submit(_validate_chunk, path, start, end, schema))
+            if len(in_flight) >= 2 * workers:
+                yield from emit(in_flight.popleft().result())
+        while in_flight:
+            yield from emit(in_flight.popleft().result())
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#  JSON array                                                              #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+
+WHITESPACE = " \t\n\r"
+
+# the strings (whose brackets and commas don't count), a quote left open and the brackets and commas
+_STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|"|[][{},]')
+
+
+def _element_end(buffer: str, position: int) -> int:
+    # where the array element starting at `position` ends (the `,` or `]` after it) without
+    # decoding it, -1 if that is past the end of the buffer
+    depth = 0
+    for match in _STRUCTURE.finditer(buffer, position):
+        token = match.group()
+        if token == '"':
+            return -1  # a string the buffer cuts in half
+        if token in "[{":
+            depth += 1
+        elif token in "]}" and depth:
+            depth -= 1
+        elif token in ",]" and not depth:
+            return match.start()
+    return -1
+
+
+def _validate_json_array(path: StrPath, schema: Type[TD], on_invalid: InvalidHandler, block_size: int = 1 << 16) -> Iterator[TD]:
+    validator = validator_for(schema)
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as file:
+        buffer = file.read(block_size).lstrip(WHITESPACE)
+        if not buffer.startswith("["):
+            raise ValueError(f"{os.fspath(path)} is not a JSON array")
+        position, index, eof = 1, 0, False
+
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE + ",":
+                position += 1
+            if position == len(buffer) or (not eof and len(buffer) - position < block_size // 2):
+                # keep only what we haven't consumed yet, plus the next block
+                block = file.read(block_size)
+                eof = not block
+                buffer, position = buffer[position:] + block, 0
+                if eof and not buffer.strip(WHITESPACE + ","):
+                    raise ValueError(f"{os.fspath(path)}: unexpected end of file, missing ']'")
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                end = _element_end(buffer, position)
+                if end != -1:
+                    # the whole element is in the buffer and it is malformed, skip to the next one
+                    on_invalid(InvalidRecord(index, [("", f"invalid JSON: {error.msg}")]))  # `error.pos` is in the buffer
+                    index += 1
+                    position = end
+                    continue
+                if eof:
+                    raise
+                # cut short by the end of the buffer
+                block = file.read(block_size)
+                eof = not block
+                buffer, position = buffer[position:] + block, 0
+                continue
+            if end == len(buffer) and not eof:
+                # the value may go on in the next block, i.e. a number cut in half
+                block = file.read(block_size)
+                eof = not block
+                buffer, position = buffer[position:] + block, 0
+                continue
+
+            issues = validator.errors(record)
+            if issues:
+                on_invalid(InvalidRecord(index, issues))
+            else:
+                yield record
+            index += 1
+            position = end
@@ -0,0 +1,278 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  TypedDict (see `1_2_typed_dict.py`) only exists for the type checker,   #
+#  at runtime a `MyUserDict` is just a `dict` and nothing checks it.       #
+#                                                                          #
+#  `validator_for(MyUserDict)` reads the annotations, `__required_keys__`  #
+#  and `__optional_keys__` of the schema once and generates the source of  #
+#  a function that checks exactly those keys, with nested schemas such as  #
+#  `extra_info: ExtraInfo` inlined. Recursive schemas such as              #
+#  `friends: list["PersonDict"]` call back into their own function.        #
+#  Compiled validators are kept in a bounded LRU cache.                    #
+#                                                                          #
+#  `validator_for(MyUserDict).errors({"name": "Carlos", "age": 15.6})`     #
+#  -> [("age", "expected int, got float")]                                 #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import collections.abc
+import itertools
+from functools import lru_cache
+from typing import (
+    Any, Callable, Generic, Literal, Type, TypedDict, TypeGuard, TypeVar, Union, cast, get_args, get_origin,
+    get_type_hints, is_typeddict,
+)
+
+TD = TypeVar("TD")
+
+# (path, message) i.e. ("extra_info.birthday", "expected str, got int")
+ValidationIssue = tuple[str, str]
+
+CheckFunction = Callable[[object, str, list[ValidationIssue]], None]
+
+
+class ValidationError(ValueError):
+
+    def __init__(self, schema: type, issues: list[ValidationIssue]) -> None:
+        self.schema = schema
+        self.issues = issues
+        details = "; ".join(f"{path or '<root>'}: {message}" for path, message in issues)
+        super().__init__(f"invalid {schema.__name__}: {details}")
+
+
+class TypedDictValidator(Generic[TD]):
+    __slots__ = ("schema", "source", "_check")
+
+    def __init__(self, schema: Type[TD], source: str, check: CheckFunction) -> None:
+        self.schema = schema
+        self.source = source  # the generated code, handy for debugging
+        self._check = check
+
+    def errors(self, value: object) -> list[ValidationIssue]:
+        issues: list[ValidationIssue] = []
+        self._check(value, "", issues)
+        return issues
+
+    def is_valid(self, value: object) -> TypeGuard[TD]:
+        issues: list[ValidationIssue] = []
+        self._check(value, "", issues)
+        return not issues
+
+    def validate(self, value: object) -> TD:
+        issues: list[ValidationIssue] = []
+        self._check(value, "", issues)
+        if issues:
+            raise ValidationError(self.schema, issues)
+        return value  # type: ignore[return-value]
+
+
+def validator_for(schema: Type[TD]) -> TypedDictValidator[TD]:
+    return _cached_validator(cast(type, schema))
+
+
+@lru_cache(maxsize=256)
+def _cached_validator(schema: type) -> TypedDictValidator[Any]:
+    # `lru_cache` erases the signature, `validator_for` gives the types back
+    source, check = _Compiler(schema).compile()
+    return TypedDictValidator(schema, source, check)
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Code generation. Paths are only built when something is wrong, so a     #
+#  valid payload never pays for string formatting.                         #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+
+def _key_path(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+def _index_path(path: str, index: object) -> str:
+    return f"{path}[{index!r}]"
+
+
+def _type_name(value: object) -> str:
+    return type(value).__name__
+
+
+def _describe(annotation: Any) -> str:
+    if annotation is type(None):
+        return "None"
+    if isinstance(annotation, type) and get_origin(annotation) is None:
+        return annotation.__name__
+    return repr(annotation).replace("typing.", "")
+
+
+class _Compiler:
+    # turns one TypedDict schema into python source, plus one extra function
+    # for every schema that refers to itself somewhere down the tree
+
+    def __init__(self, root: type) -> None:
+        self.root = root
+        self.functions: dict[type, str] = {}
+        self.pending: list[type] = []
+        self.namespace: dict[str, Any] = {
+            "_key_path": _key_path,
+            "_index_path": _index_path,
+            "_type_name": _type_name,
+        }
+        self.counter = itertools.count()
+
+    def compile(self) -> tuple[str, CheckFunction]:
+        self._function_name(self.root)
+        chunks: list[str] = []
+        while self.pending:
+            chunks.append(self._emit_function(self.pending.pop()))
+        source = "\n\n".join(chunks)
+        exec(compile(source, f"<validator for {self.root.__name__}>", "exec"), self.namespace)
+        return source, self.namespace[self.functions[self.root]]
+
+    def _function_name(self, schema: type) -> str:
+        if schema not in self.functions:
+            self.functions[schema] = f"_check_{schema.__name__}_{next(self.counter)}"
+            self.pending.append(schema)
+        return self.functions[schema]
+
+    def _constant(self, value: object) -> str:
+        name = f"_const_{next(self.counter)}"
+        self.namespace[name] = value
+        return name
+
+    def _fail(self, pad: str, errors: str, path: str, message: str, var: str, describe: str = "_type_name") -> str:
+        return f"{pad}    {errors}.append(({path}, {message!r} + {describe}({var})))"
+
+    def _emit_function(self, schema: type) -> str:
+        lines = [f"def {self.functions[schema]}(value, path, errors):"]
+        lines += self._emit_typed_dict(schema, "value", "path", "errors", 1, (schema,))
+        return "\n".join(lines)
+
+    def _emit_typed_dict(self, schema: type, var: str, path: str, errors: str, depth: int, stack: tuple[type, ...]) -> list[str]:
+        pad = "    " * depth
+        hints = get_type_hints(schema)
+        required: frozenset[str] = schema.__required_keys__  # type: ignore[attr-defined]
+        known = self._constant(frozenset(hints))
+        item = f"v{depth}"
+
+        lines = [
+            f"{pad}if not isinstance({var}, dict):",
+            self._fail(pad, errors, path, f"expected {schema.__name__}, got ", var),
+            f"{pad}else:",
+            f"{pad}    if not {known}.issuperset({var}):",
+            f"{pad}        for _extra in {var}:",
+            f"{pad}            if _extra not in {known}:",
+            f"{pad}                {errors}.append((_key_path({path}, str(_extra)), 'unexpected key'))",
+        ]
+        for key, annotation in hints.items():
+            key_path = f"_key_path({path}, {key!r})"
+            lines.append(f"{pad}    if {key!r} in {var}:")
+            lines.append(f"{pad}        {item} = {var}[{key!r}]")
+            body = self._emit(annotation, item, key_path, errors, depth + 2, stack)
+            lines += body or [f"{pad}        pass"]
+            if key in required:
+                lines.append(f"{pad}    else:")
+                lines.append(f"{pad}        {errors}.append(({key_path}, 'missing required key'))")
+        return lines
+
+    def _emit(self, annotation: Any, var: str, path: str, errors: str, depth: int, stack: tuple[type, ...]) -> list[str]:
+        pad = "    " * depth
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if annotation is Any or annotation is object:
+            return []
+
+        if is_typeddict(annotation):
+            if annotation in stack:
+                # recursive schema, this one gets a function of its own
+                return [f"{pad}{self._function_name(annotation)}({var}, {path}, {errors})"]
+            return self._emit_typed_dict(annotation, var, path, errors, depth, stack + (annotation,))
+
+        if origin is Literal:
+            allowed = self._constant(frozenset(args))
+            return [
+                f"{pad}if {var} not in {allowed}:",
+                self._fail(pad, errors, path, f"expected one of {list(args)!r}, got ", var, "repr"),
+            ]
+
+        if origin is Union:
+            return self._emit_union(annotation, args, var, path, errors, depth, stack)
+
+        if origin in (list, collections.abc.Sequence, collections.abc.Iterable):
+            item_type = args[0] if args else Any
+            index, item = f"i{depth}", f"v{depth}"
+            lines = [
+                f"{pad}if not isinstance({var}, list):",
+                self._fail(pad, errors, path, "expected list, got ", var),
+            ]
+            body = self._emit(item_type, item, f"_index_path({path}, {index})", errors, depth + 2, stack)
+            if body:
+                lines += [f"{pad}else:", f"{pad}    for {index}, {item} in enumerate({var}):", *body]
+            return lines
+
+        if origin in (dict, collections.abc.Mapping):
+            key_type, value_type = args if args else (Any, Any)
+            key, item = f"k{depth}", f"v{depth}"
+            lines = [
+                f"{pad}if not isinstance({var}, dict):",
+                self._fail(pad, errors, path, "expected dict, got ", var),
+            ]
+            key_body = self._emit(key_type, key, f"_index_path({path}, {key})", errors, depth + 2, stack)
+            value_body = self._emit(value_type, item, f"_index_path({path}, {key})", errors, depth + 2, stack)
+            if key_body or value_body:
+                lines += [f"{pad}else:", f"{pad}    for {key}, {item} in {var}.items():", *key_body, *value_body]
+            return lines
+
+        if annotation is None or annotation is type(None):
+            return [
+                f"{pad}if {var} is not None:",
+                self._fail(pad, errors, path, "expected None, got ", var),
+            ]
+
+        # plain classes, with the numeric promotion type checkers apply (an int is a valid float)
+        accepted = (int, float) if annotation is float else (origin or annotation)
+        if not isinstance(accepted, (type, tuple)):
+            return []  # nothing we know how to check at runtime, i.e. a TypeVar
+        return [
+            f"{pad}if not isinstance({var}, {self._constant(accepted)}):",
+            self._fail(pad, errors, path, f"expected {_describe(annotation)}, got ", var),
+        ]
+
+    def _emit_union(self, annotation: Any, args: tuple[Any, ...], var: str, path: str, errors: str, depth: int, stack: tuple[type, ...]) -> list[str]:
+        # every member checks into its own scratch list, the first one with no errors wins
+        pad = "    " * depth
+        matched, scratch = f"m{depth}", f"e{depth}"
+        lines = [f"{pad}{matched} = False"]
+        for member in args:
+            body = self._emit(member, var, path, scratch, depth + 1, stack)
+            if not body:
+                return []  # `Optional[Any]` and friends accept everything
+            lines += [
+                f"{pad}if not {matched}:",
+                f"{pad}    {scratch} = []",
+                *body,
+                f"{pad}    {matched} = not {scratch}",
+            ]
+        lines += [
+            f"{pad}if not {matched}:",
+            self._fail(pad, errors, path, f"expected {_describe(annotation)}, got ", var),
+        ]
+        return lines
+
+
+class ExtraInfo(TypedDict):
+    birthday: str
+
+
+class MyUserDict(TypedDict, total=False):
+    name: str
+    age: int
+
+    extra_info: ExtraInfo
+
+
+my_user_validator = validator_for(MyUserDict)
+
+valid_user = my_user_validator.validate({"name": "Carlos", "age": 15, "extra_info": {"birthday": "sunday"}})
+user_errors = my_user_validator.errors({"name": "Carlos", "age": 15.6, "invalid_key": {}})
+# [("invalid_key", "unexpected key"), ("age", "expected int, got float")]
+
@@ -0,0 +1,172 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Batch counterparts of `sum_tuple`, `average_of` and `multiply` (see     #
+#  `2_functions.py`). They take plain numbers, sequences, `array.array`    #
+#  or NumPy arrays, and use `@overload` the same way `return_value_2`      #
+#  does so the type checker knows what comes back:                         #
+#                                                                          #
+#  `multiply(3, 5)`                       -> int                           #
+#  `multiply(array("d", [1.5]), 2)`       -> array[float]                  #
+#  `multiply(np.arange(10), 2)`           -> ndarray                       #
+#                                                                          #
+#  The loops happen in C: NumPy ufuncs for NumPy arrays and, through a     #
+#  view of their buffer, for `array.array`. Lists (and `array.array` when  #
+#  NumPy isn't installed) use `map` with the `operator` functions.         #
+#                                                                          #
+#  An `array.array` keeps its type code and the results are exact with or  #
+#  without NumPy: when the range of the values says a product or a sum     #
+#  could overflow the integer type, Python ints do the arithmetic and an   #
+#  `OverflowError` is raised for a result the array can't hold.            #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import operator
+from array import array
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, TypeVar, Union, overload
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # NumPy is optional, `array.array` and lists still work
+    np = None  # type: ignore[assignment, unused-ignore]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray  # type: ignore[import-not-found, unused-ignore]
+
+# like `T = TypeVar("T", int, float)` in `generics/1_basic_use.py`, an int batch stays int
+N = TypeVar("N", int, float)
+
+Batch = Union[list[N], tuple[N, ...], "array[N]"]
+
+
+def _is_numpy(value: object) -> bool:
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _numpy_view(values: "array[Any]") -> Any:
+    # no copy, NumPy reads the buffer of the `array.array`
+    return np.frombuffer(values, dtype=values.typecode)
+
+
+def _typecode_of(a: "array[Any]", b: object) -> str:
+    # the type code of `a`, unless a float makes an int array a float one
+    if a.typecode in "fd" or not (isinstance(b, float) or (isinstance(b, array) and b.typecode in "fd")):
+        return a.typecode
+    return "d"
+
+
+def _limits(typecode: str) -> tuple[int, int]:
+    bits = 8 * array(typecode).itemsize
+    if typecode in "BHILQ":
+        return 0, 2 ** bits - 1
+    return -2 ** (bits - 1), 2 ** (bits - 1) - 1
+
+
+def _range_of(values: Any) -> tuple[int, int]:
+    # smallest and largest value of an int array or scalar, as Python ints so nothing overflows here
+    if not isinstance(values, array):
+        return int(values), int(values)
+    if not values:
+        return 0, 0
+    view = _numpy_view(values)
+    return int(view.min()), int(view.max())
+
+
+def _fits(typecode: str, low: int, high: int) -> bool:
+    lowest, highest = _limits(typecode)
+    return lowest <= low and high <= highest
+
+
+def _product_fits(typecode: str, a: "array[Any]", b: object) -> bool:
+    if typecode in "fd":
+        return True
+    (a_low, a_high), (b_low, b_high) = _range_of(a), _range_of(b)
+    if not isinstance(b, array) and not _fits(typecode, b_low, b_high):
+        return False  # NumPy can't even convert the scalar, whatever the products are
+    corners = (a_low * b_low, a_low * b_high, a_high * b_low, a_high * b_high)
+    return _fits(typecode, min(corners), max(corners))
+
+
+def _sum_typecode(values: "array[Any]") -> str:
+    # NumPy adds ints up in 64 bits (unsigned for unsigned arrays), or in the floats themselves
+    if values.typecode in "fd":
+        return values.typecode
+    return "Q" if values.typecode in "BHILQ" else "q"
+
+
+@overload
+def sum_of(values: Batch[N]) -> N: ...
+
+
+@overload
+def sum_of(values: "NDArray[Any]") -> float: ...
+
+
+def sum_of(values: Any) -> Any:
+    if isinstance(values, array) and np is not None:
+        typecode = _sum_typecode(values)
+        if typecode in "fd" or _fits(typecode, *(bound * len(values) for bound in _range_of(values))):
+            return _numpy_view(values).sum(dtype=typecode).item()
+        return sum(values)  # the total may not fit in 64 bits, Python ints don't overflow
+    if _is_numpy(values):
+        return values.sum().item()  # a Python number, not a NumPy scalar
+    return sum(values)
+
+
+def average(values: Union[Batch[int], Batch[float], "NDArray[Any]"]) -> float:
+    # `average_of()` raises `ZeroDivisionError` for no values, here we say what went wrong
+    if not len(values):
+        raise ValueError("average of an empty batch")
+    if isinstance(values, array) and np is not None:
+        return float(_numpy_view(values).mean())
+    if _is_numpy(values):
+        return float(values.mean())  # type: ignore[union-attr, unused-ignore]
+    return sum(values) / len(values)  # type: ignore[arg-type, unused-ignore]
+
+
+@overload
+def multiply(a: N, b: N) -> N: ...
+
+
+@overload
+def multiply(a: "array[N]", b: Union[N, "array[N]"]) -> "array[N]": ...
+
+
+@overload
+def multiply(a: Union[list[N], tuple[N, ...]], b: Union[N, list[N], tuple[N, ...]]) -> list[N]: ...
+
+
+@overload
+def multiply(a: "NDArray[Any]", b: Union[float, "NDArray[Any]"]) -> "NDArray[Any]": ...
+
+
+def multiply(a: Any, b: Any) -> Any:
+    if isinstance(a, (int, float)):
+        if not isinstance(b, (int, float)):
+            # `3 * [1, 2]` would repeat the list, the batch goes first
+            raise TypeError(f"multiply a batch by a number as multiply(batch, {a!r}), not the other way round")
+        return a * b
+    if _is_numpy(a) or _is_numpy(b):
+        return np.multiply(a, b)
+    scalar = isinstance(b, (int, float))
+    if not scalar and len(a) != len(b):
+        raise ValueError(f"can't multiply batches of {len(a)} and {len(b)} values")
+
+    if isinstance(a, array):
+        typecode = _typecode_of(a, b)
+        if np is not None and (scalar or isinstance(b, array)) and _product_fits(typecode, a, b):
+            other = _numpy_view(b) if isinstance(b, array) else b
+            return array(typecode, np.multiply(_numpy_view(a), other, dtype=typecode).tobytes())
+        # Python ints, the array raises `OverflowError` for a product it can't hold
+        products = map(operator.mul, a, repeat(b, len(a))) if scalar else map(operator.mul, a, b)
+        return array(typecode, products)
+
+    products = map(operator.mul, a, repeat(b, len(a))) if scalar else map(operator.mul, a, b)
+    return list(products)
+
+
+my_total = sum_of((1, 2, 3, 4))
+my_average = average(array("q", [2, 4, 9]))
+my_products = multiply(array("q", [1, 2, 3]), 5)  # array('q', [5, 10, 15])
+my_result = multiply(3, 5)  # still a plain int
+my_floats = multiply(array("d", [1.5, 2.5]), 2)  # array('d', [3.0, 5.0])
+# multiply(array("q", [1, 2]), 2.5)  # type error, an int array can't hold the floats
@@ -0,0 +1,77 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Shared helpers for the benchmarks.                                      #
+#                                                                          #
+#  The examples can't be imported as usual, their names start with a digit #
+#  and some of their lines fail on purpose (`my_test_2.not_a_method()`),   #
+#  so `load_example` imports them through the hook in `lazy_examples.py`,  #
+#  which runs them one top level statement at a time and just skips the    #
+#  statements that raise.                                                  #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import contextlib
+import importlib
+import io
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, TypeVar
+
+from lazy_examples import alias_of
+
+ROOT = Path(__file__).resolve().parent.parent
+
+R = TypeVar("R")
+
+
+def load_example(relative_path: str) -> ModuleType:
+    module = importlib.import_module(alias_of(relative_path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        vars(module)  # executed now rather than by the first attribute a benchmark times
+    return module
+
+
+def best_of(function: Callable[[], object], repeat: int = 5) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def allocated_bytes(function: Callable[[], R]) -> tuple[R, int]:
+    # memory still held by whatever `function` returns
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def _grown_peak(case: Callable[..., object], *args: Any) -> tuple[float, int]:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    case(*args)  # what it returns is dropped here, it isn't pickled back
+    elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before  # KiB on Linux
+
+
+def peak_memory_grown(case: Callable[..., object], *args: Any) -> tuple[float, int]:
+    # seconds taken by `case(*args)` and KiB its peak resident size grew by, in a fresh
+    # process whose peak starts low, `case` must be a module level function
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_grown_peak, case, *args).result()
+
+
+def print_table(title: str, header: tuple[str, ...], rows: list[tuple[object, ...]]) -> None:
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    print(f"\n{title}")
+    for row in (header, *rows):
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
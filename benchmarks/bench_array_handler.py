@@ -0,0 +1,69 @@
+# Memory per element and add/get throughput of `ArrayListHandler` against the
+# plain `MyListHandler` from `generics/2_own_generics.py`
+#
+# `python -m benchmarks.bench_array_handler`
+import random
+from typing import Callable, Sequence
+
+from benchmarks._support import allocated_bytes, best_of, load_example, print_table
+from generics.array_handler import ArrayListHandler, np
+
+own_generics = load_example("generics/2_own_generics.py")
+
+SIZE = 1_000_000
+
+
+def candidates() -> dict[str, Callable[[], object]]:
+    result: dict[str, Callable[[], object]] = {
+        "MyListHandler": own_generics.MyListHandler,
+        "ArrayListHandler list": lambda: ArrayListHandler(int, backend="list"),
+        "ArrayListHandler array": lambda: ArrayListHandler(int, backend="array"),
+    }
+    if np is not None:
+        result["ArrayListHandler numpy"] = lambda: ArrayListHandler(int, backend="numpy")
+    return result
+
+
+def fill_one_by_one(factory: Callable[[], object], values: Sequence[int]) -> object:
+    handler = factory()
+    add = handler.add  # type: ignore[attr-defined]
+    for value in values:
+        add(value)
+    return handler
+
+
+def main() -> None:
+    # big values so python doesn't hand us the cached small int objects
+    values = [random.randrange(10 ** 9, 10 ** 12) for _ in range(SIZE)]
+    indices = [random.randrange(SIZE) for _ in range(SIZE // 10)]
+
+    rows: list[tuple[object, ...]] = []
+    for name, factory in candidates().items():
+        # `value + 1` builds new int objects, so the list based handlers pay for them
+        handler, size = allocated_bytes(lambda: fill_one_by_one(factory, [value + 1 for value in values]))
+        add_time = best_of(lambda: fill_one_by_one(factory, values), repeat=3)
+        get_at = handler.get_at  # type: ignore[attr-defined]
+        get_time = best_of(lambda: [get_at(index) for index in indices], repeat=3)
+        if hasattr(handler, "extend"):
+            extend_time = best_of(lambda: factory().extend(values), repeat=3)  # type: ignore[attr-defined]
+            get_many_time = best_of(lambda: handler.get_many(indices), repeat=3)  # type: ignore[attr-defined]
+            bulk = f"{SIZE / extend_time / 1e6:.1f}", f"{len(indices) / get_many_time / 1e6:.1f}"
+        else:
+            bulk = "-", "-"
+        rows.append((
+            name,
+            f"{size / SIZE:.1f}",
+            f"{SIZE / add_time / 1e6:.1f}",
+            f"{len(indices) / get_time / 1e6:.1f}",
+            *bulk,
+        ))
+
+    print_table(
+        f"{SIZE:,} int elements (throughput in millions of elements per second)",
+        ("container", "bytes/elem", "add", "get_at", "extend", "get_many"),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
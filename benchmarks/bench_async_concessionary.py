@@ -0,0 +1,50 @@
+# Throughput and latency percentiles of `AsyncConcessionary.serve` with more
+# and more workers, against selling the vehicles one at a time the way
+# `Concessionary.client_buys()` of `protocols/2_custom.py` does
+#
+# `python -m benchmarks.bench_async_concessionary`
+import asyncio
+import time
+
+from benchmarks._support import print_table
+from protocols.async_concessionary import AsyncConcessionary, PurchaseOrder
+
+ORDERS = 2_000
+
+
+def orders() -> list[PurchaseOrder]:
+    return [PurchaseOrder(f"client {number}", "car" if number % 2 else "motorcycle") for number in range(ORDERS)]
+
+
+async def one_at_a_time() -> float:
+    concessionary = AsyncConcessionary()
+    start = time.perf_counter()
+    for order in orders():
+        await concessionary.client_buys(order.vehicle_type)
+    return time.perf_counter() - start
+
+
+async def concurrently(concessionary: AsyncConcessionary) -> float:
+    start = time.perf_counter()
+    async for _ in concessionary.serve(orders()):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rows: list[tuple[object, ...]] = [("one at a time", "-", f"{ORDERS / asyncio.run(one_at_a_time()):,.0f}", "-", "-", "-")]
+    for workers in (1, 8, 64, 256):
+        concessionary = AsyncConcessionary(workers=workers, queue_size=2 * workers)
+        elapsed = asyncio.run(concurrently(concessionary))
+        latency = {name: f"{value * 1e3:.1f}" for name, value in concessionary.latency.summary().items()}
+        rows.append(("serve", workers, f"{ORDERS / elapsed:,.0f}", latency["p50"], latency["p99"], latency["max"]))
+
+    print_table(
+        f"{ORDERS:,} orders, 1ms to build a vehicle (latency in ms)",
+        ("mode", "workers", "orders/s", "p50", "p99", "max"),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
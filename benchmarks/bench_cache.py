@@ -0,0 +1,99 @@
+# `Cache` of `generics/cache.py` against a bare dict and `functools.lru_cache`
+# on a skewed key stream, plus the number of loads when threads miss the same
+# keys at once
+#
+# `python -m benchmarks.bench_cache`
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Callable
+
+from benchmarks._support import best_of, load_example, print_table
+from generics.cache import Cache
+
+basic_use_example = load_example("generics/1_basic_use.py")
+
+LOOKUPS = 200_000
+KEYS = 10_000
+MAXSIZE = 1_000
+
+
+def load(key: int) -> str:
+    return f"value {key}"
+
+
+def main() -> None:
+    random.seed(0)
+    # most lookups go to a few keys, as they usually do
+    stream = [int(random.paretovariate(0.4)) % KEYS for _ in range(LOOKUPS)]
+    lookup_name: Callable[..., str] = basic_use_example.lookup_name
+
+    def bare_dict() -> None:
+        values: dict[int, str] = {}
+        for key in stream:
+            if key not in values:
+                values[key] = load(key)
+            lookup_name(values, key, "")
+
+    def functools_cache() -> None:
+        cached = lru_cache(maxsize=MAXSIZE)(load)
+        for key in stream:
+            cached(key)
+
+    def cache_get_or_compute() -> Cache[int, str]:
+        cache: Cache[int, str] = Cache(maxsize=MAXSIZE)
+        for key in stream:
+            cache.get_or_compute(key, load)
+        return cache
+
+    def cache_lookup_name() -> None:
+        cache: Cache[int, str] = Cache(maxsize=MAXSIZE)
+        for key in stream:
+            if lookup_name(cache, key, None) is None:
+                cache[key] = load(key)
+
+    def cache_ttl_and_bytes() -> None:
+        cache: Cache[int, str] = Cache(maxsize=None, ttl=60.0, max_bytes=MAXSIZE * 60)
+        for key in stream:
+            cache.get_or_compute(key, load)
+
+    stats = cache_get_or_compute().stats()
+    rows: list[tuple[object, ...]] = [
+        (name, f"{best_of(function, repeat=3) / LOOKUPS * 1e9:.0f}")
+        for name, function in [
+            ("dict + lookup_name (unbounded)", bare_dict),
+            (f"functools.lru_cache({MAXSIZE})", functools_cache),
+            (f"Cache({MAXSIZE}).get_or_compute", cache_get_or_compute),
+            (f"lookup_name(Cache({MAXSIZE}))", cache_lookup_name),
+            ("Cache(ttl, max_bytes).get_or_compute", cache_ttl_and_bytes),
+        ]
+    ]
+    print_table(
+        f"{LOOKUPS:,} lookups, hit ratio {stats.hit_ratio:.1%}, {stats.evictions:,} evictions",
+        ("cache", "ns per lookup"),
+        rows,
+    )
+
+    loads = 0
+
+    def slow_load(key: int) -> str:
+        nonlocal loads
+        loads += 1
+        time.sleep(0.01)
+        return load(key)
+
+    shared: Cache[int, str] = Cache()
+    threads = [
+        threading.Thread(target=lambda: [shared.get_or_compute(key, slow_load) for key in range(10)])
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"\n16 threads reading the same 10 missing keys: {loads} loads")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Memory of 10M vehicles whose engine type was parsed from text, with the
+# `Vehicle` of `basics/3_dataclasses.py` (a copy of the string each), with
+# `sys.intern`, with `CategoricalVehicle` of `basics/categorical.py` and as a
+# packed column of codes, and the time to compare the engine types of
+# neighbouring vehicles. Each memory case runs in its own process, the
+# memory is how much its peak resident size grew.
+#
+# `python -m benchmarks.bench_categorical [--count 10000000]`
+import argparse
+import operator
+import sys
+from itertools import cycle, islice
+from typing import Any, Callable, Iterator
+
+from basics.categorical import ENGINE_TYPES, CategoricalVehicle
+from benchmarks._support import best_of, load_example, peak_memory_grown, print_table
+
+dataclasses_example = load_example("basics/3_dataclasses.py")
+Vehicle: Any = dataclasses_example.Vehicle
+
+ROWS = ("small,motor cycle", "medium,car", "large,car", "medium,car")
+COMPARED = 1_000_000
+
+
+def parsed_engine_types(count: int) -> Iterator[str]:
+    # as read from a CSV file, every value is a new string
+    return (row.split(",")[0] for row in islice(cycle(ROWS), count))
+
+
+def copies(count: int) -> list[Any]:
+    return [Vehicle(engine_type=engine_type) for engine_type in parsed_engine_types(count)]
+
+
+def interned(count: int) -> list[Any]:
+    return [Vehicle(engine_type=sys.intern(engine_type)) for engine_type in parsed_engine_types(count)]
+
+
+def categorical(count: int) -> list[CategoricalVehicle]:
+    return [CategoricalVehicle(engine_type) for engine_type in parsed_engine_types(count)]  # type: ignore[arg-type]
+
+
+def codes(count: int) -> object:
+    return ENGINE_TYPES.codes(parsed_engine_types(count))
+
+
+def _equal_neighbours(engine_types: list[str]) -> Callable[[], int]:
+    return lambda: sum(map(operator.eq, engine_types, engine_types[1:]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10_000_000)
+    count = parser.parse_args().count
+
+    cases = [
+        ("Vehicle, a str each", copies),
+        ("Vehicle + sys.intern", interned),
+        ("CategoricalVehicle", categorical),
+        ("array('B') of codes", codes),
+    ]
+    rows: list[tuple[object, ...]] = []
+    for name, case in cases:
+        grown = peak_memory_grown(case, count)[1] / 1024
+        rows.append((name, f"{grown:.0f}", f"{grown * 2 ** 20 / count:.0f}"))
+    print_table(f"{count:,} vehicles", ("how", "peak MiB grown", "bytes per vehicle"), rows)
+
+    comparisons = [
+        ("copies", _equal_neighbours([vehicle.engine_type for vehicle in copies(COMPARED)])),
+        ("interned", _equal_neighbours([vehicle.engine_type for vehicle in categorical(COMPARED)])),
+    ]
+    packed = ENGINE_TYPES.codes(parsed_engine_types(COMPARED))
+    comparisons.append(("codes", lambda: sum(map(operator.eq, packed, packed[1:]))))
+    print_table(
+        f"== between the engine types of {COMPARED:,} neighbouring vehicles",
+        ("values", "ns per comparison"),
+        [(name, f"{best_of(compare, 3) / COMPARED * 1e9:.1f}") for name, compare in comparisons],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Scaling from 1 to N workers of `generics/concurrent_handlers.py`: threads
+# appending to `ConcurrentListHandler` against a list behind a lock, and pool
+# processes summing a `SharedListHandler` against sending them pickled lists
+#
+# `python -m benchmarks.bench_concurrent_handlers`
+import os
+import threading
+from functools import partial
+from multiprocessing import Pool
+from typing import Callable
+
+from benchmarks._support import best_of, print_table
+from generics.concurrent_handlers import ConcurrentListHandler, SharedListHandler
+
+APPENDS = 200_000
+VALUES = 2_000_000
+WORKERS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+
+class LockedListHandler:
+    # `MyListHandler` made safe the obvious way, one lock around everything
+
+    def __init__(self) -> None:
+        self.my_list: list[int] = []
+        self.lock = threading.Lock()
+
+    def add(self, val: int) -> None:
+        with self.lock:
+            self.my_list.append(val)
+
+
+def _in_threads(workers: int, add: Callable[[int], None]) -> None:
+    def work() -> None:
+        for value in range(APPENDS // workers):
+            add(value)
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _sum_list(values: list[float]) -> float:
+    return sum(values)
+
+
+def _sum_shared(handler: SharedListHandler[float], bounds: tuple[int, int]) -> float:
+    window = handler.view(*bounds)  # attached to the parent's memory, nothing was copied
+    try:
+        return sum(window)
+    finally:
+        window.release()
+
+
+def _chunks(workers: int) -> list[tuple[int, int]]:
+    size = -(-VALUES // workers)
+    return [(start, min(start + size, VALUES)) for start in range(0, VALUES, size)]
+
+
+def main() -> None:
+    thread_rows: list[tuple[object, ...]] = []
+    for workers in WORKERS:
+        thread_rows.append((
+            workers,
+            f"{best_of(lambda: _in_threads(workers, LockedListHandler().add), repeat=3) * 1e3:.1f}",
+            f"{best_of(lambda: _in_threads(workers, ConcurrentListHandler[int]().add), repeat=3) * 1e3:.1f}",
+        ))
+    print_table(f"{APPENDS:,} appends split over threads (ms)", ("threads", "list + lock", "concurrent"), thread_rows)
+
+    values = [float(value) for value in range(VALUES)]
+    process_rows: list[tuple[object, ...]] = []
+    with SharedListHandler(float, capacity=VALUES) as shared:
+        shared.extend(values)
+        for workers in WORKERS:
+            with Pool(workers) as pool:
+                chunks = _chunks(workers)
+                pickled = best_of(lambda: pool.map(_sum_list, [values[start:stop] for start, stop in chunks]), 3)
+                zero_copy = best_of(lambda: pool.map(partial(_sum_shared, shared), chunks), 3)
+            process_rows.append((workers, f"{pickled * 1e3:.1f}", f"{zero_copy * 1e3:.1f}"))
+    print_table(
+        f"summing {VALUES:,} floats in a process pool (ms)",
+        ("processes", "pickled lists", "shared memory"),
+        process_rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
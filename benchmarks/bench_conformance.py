@@ -0,0 +1,46 @@
+# Cost per call of the cached `checker_for(protocol)` and `ProtocolDispatch`
+# against `isinstance` on the runtime checkable protocols of
+# `protocols/1_standard.py`
+#
+# `python -m benchmarks.bench_conformance`
+from typing import runtime_checkable
+
+from benchmarks._support import best_of, load_example, print_table
+from protocols.conformance import ProtocolDispatch, checker_for
+
+standard = load_example("protocols/1_standard.py")
+Barker = runtime_checkable(standard.Barker)
+NamedProtocol = runtime_checkable(standard.NamedProtocol)
+
+CALLS = 200_000
+
+
+def per_call(function: object) -> str:
+    elapsed = best_of(lambda: [function() for _ in range(CALLS)])  # type: ignore[operator]
+    return f"{elapsed / CALLS * 1e9:.0f}"
+
+
+def main() -> None:
+    dog = standard.Dog()
+    named = standard.ValidNamedClass(name="test", last_name="valid")
+    invalid = standard.InvalidNamedClass(name="test", last_name="valid")
+    is_barker, is_named = checker_for(Barker), checker_for(NamedProtocol)
+
+    dispatch = ProtocolDispatch[str]()
+    dispatch.register(Barker, lambda barker: "barker")
+    dispatch.register(NamedProtocol, lambda named: named.full_name)
+
+    print_table(
+        "protocol checks (ns per call)",
+        ("object", "isinstance", "checker_for", "ProtocolDispatch"),
+        [
+            ("Dog (Barker)", per_call(lambda: isinstance(dog, Barker)), per_call(lambda: is_barker(dog)), per_call(lambda: dispatch(dog))),
+            ("ValidNamedClass", per_call(lambda: isinstance(named, NamedProtocol)), per_call(lambda: is_named(named)), per_call(lambda: dispatch(named))),
+            ("InvalidNamedClass", per_call(lambda: isinstance(invalid, NamedProtocol)), per_call(lambda: is_named(invalid)), "-"),
+        ],
+    )
+    print(f"\nisinstance(InvalidNamedClass(), NamedProtocol) = {isinstance(invalid, NamedProtocol)}, checker says {is_named(invalid)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# Overhead per call of the decorators of `basics/decorators.py` on `multiply`,
+# against the undecorated function, `print_args_method` of
+# `basics/2_functions.py` and `functools.lru_cache`
+#
+# `python -m benchmarks.bench_decorators`
+import contextlib
+import io
+from functools import lru_cache
+from typing import Callable
+
+from basics.decorators import memoize, traced
+from benchmarks._support import best_of, load_example, print_table
+
+functions_example = load_example("basics/2_functions.py")
+
+CALLS = 200_000
+
+
+def multiply(a: int, b: int) -> int:
+    return a * b
+
+
+def main() -> None:
+    decorated: list[tuple[str, Callable[[int, int], int]]] = [
+        ("undecorated", multiply),
+        ("print_args_method (2_functions.py)", functions_example.print_args_method(multiply)),
+        ("traced(every=1000)", traced(every=1000, sink=lambda line: None)(multiply)),
+        ("memoize(maxsize=None)", memoize(maxsize=None)(multiply)),
+        ("memoize(maxsize=128)", memoize(maxsize=128)(multiply)),
+        ("memoize(ttl=60)", memoize(maxsize=None, ttl=60.0)(multiply)),
+        ("functools.lru_cache(maxsize=128)", lru_cache(maxsize=128)(multiply)),
+    ]
+
+    rows: list[tuple[object, ...]] = []
+    for name, function in decorated:
+        def calls() -> None:
+            for value in range(CALLS):
+                function(value % 100, 3)  # 100 distinct arguments, the caches hit after the first round
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = best_of(calls, repeat=3)
+        rows.append((name, f"{elapsed / CALLS * 1e9:.0f}"))
+
+    print_table(f"{CALLS:,} calls of multiply", ("decorator", "ns per call"), rows)
+
+
+if __name__ == '__main__':
+    main()
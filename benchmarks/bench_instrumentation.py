@@ -0,0 +1,88 @@
+# Cost of `@timed` from `basics/instrumentation.py` when disabled and enabled,
+# then a profile of `ListOfNames.get_names`, `Factory.construct_vehicle` and
+# `ArrayListHandler` instrumented with `instrument(...)`
+#
+# `python -m benchmarks.bench_instrumentation [--speedscope profile.json]`
+import argparse
+from typing import Callable
+
+from basics import instrumentation
+from basics.instrumentation import REGISTRY, instrument, timed, uninstrument
+from benchmarks._support import best_of, load_example, print_table
+from generics.array_handler import ArrayListHandler
+
+standard_example = load_example("protocols/1_standard.py")
+dataclasses_example = load_example("basics/3_dataclasses.py")
+
+CALLS = 200_000
+
+
+def multiply(a: int, b: int) -> int:
+    return a * b
+
+
+def _per_call(function: Callable[[int, int], int]) -> str:
+    def calls() -> None:
+        for value in range(CALLS):
+            function(value, 3)
+
+    return f"{best_of(calls, repeat=3) / CALLS * 1e9:.0f}"
+
+
+def _workload() -> None:
+    names = standard_example.ListOfNames()
+    for _ in range(2_000):
+        names.add(standard_example.ParentClass(name="test", last_name="valid"))
+    for _ in range(50):
+        names.get_names()
+
+    factory = dataclasses_example.Factory
+    for _ in range(10_000):
+        factory.construct_vehicle(dataclasses_example.Car, "medium")
+
+    handler: ArrayListHandler[int] = ArrayListHandler(int)
+    for value in range(10_000):
+        handler.add(value)
+    for index in range(10_000):
+        handler.get_at(index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--speedscope", help="also write the profile as a speedscope file")
+    arguments = parser.parse_args()
+
+    timed_multiply = timed(multiply)
+    rows: list[tuple[object, ...]] = [("undecorated", _per_call(multiply))]
+    instrumentation.disable()
+    rows.append(("@timed, disabled", _per_call(timed_multiply)))
+    instrumentation.enable()
+    rows.append(("@timed, enabled", _per_call(timed_multiply)))
+    print_table(f"{CALLS:,} calls of multiply", ("", "ns per call"), rows)
+
+    handler_class = type(ArrayListHandler(int))  # the storage class picked for ints
+    targets = [
+        (standard_example.ListOfNames, ("get_names",)),
+        (dataclasses_example.Factory, ("construct_vehicle",)),
+        (handler_class, ("add", "get_at")),
+    ]
+    REGISTRY.reset()
+    for cls, method_names in targets:
+        instrument(cls, *method_names)
+    try:
+        with instrumentation.measure("workload"):
+            _workload()
+    finally:
+        for cls, method_names in targets:
+            uninstrument(cls, *method_names)
+        instrumentation.disable()
+
+    print("\nprofile of the instrumented examples")
+    print(REGISTRY.report())
+    if arguments.speedscope:
+        REGISTRY.export_speedscope(arguments.speedscope)
+        print(f"\nwrote {arguments.speedscope}, open it on https://www.speedscope.app")
+
+
+if __name__ == '__main__':
+    main()
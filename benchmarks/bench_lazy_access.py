@@ -0,0 +1,56 @@
+# Peak memory and time to get the last items of a generator with
+# `generics/lazy_access.py`, against building the list `get_last_2` of
+# `generics/1_basic_use.py` needs. Each case runs in its own process, the
+# memory is how much its peak resident size grew.
+#
+# `python -m benchmarks.bench_lazy_access [--size 100000000] [--list-size 10000000]`
+import argparse
+from typing import Iterator
+
+from benchmarks._support import load_example, peak_memory_grown, print_table
+from generics.lazy_access import get_last_2, last_n, nth
+
+basic_use_example = load_example("generics/1_basic_use.py")
+
+
+def numbers(size: int) -> Iterator[int]:
+    return (number for number in range(size))
+
+
+def list_then_get_last(size: int) -> object:
+    return basic_use_example.get_last_2(list(numbers(size)))
+
+
+def lazy_get_last(size: int) -> object:
+    return get_last_2(numbers(size))
+
+
+def lazy_last_1000(size: int) -> object:
+    return last_n(numbers(size), 1_000)
+
+
+def lazy_nth_from_end(size: int) -> object:
+    return nth(numbers(size), -10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000_000)
+    parser.add_argument("--list-size", type=int, default=10_000_000, help="building the list needs ~36 bytes per item")
+    arguments = parser.parse_args()
+
+    cases = [
+        ("list(generator) + get_last_2", list_then_get_last, arguments.list_size),
+        ("get_last_2(generator)", lazy_get_last, arguments.size),
+        ("last_n(generator, 1000)", lazy_last_1000, arguments.size),
+        ("nth(generator, -10)", lazy_nth_from_end, arguments.size),
+    ]
+    rows: list[tuple[object, ...]] = []
+    for name, case, size in cases:
+        elapsed, grown_kib = peak_memory_grown(case, size)
+        rows.append((name, f"{size:,}", f"{elapsed:.2f}", f"{grown_kib / 1024:.1f}"))
+    print_table("last items of a generator", ("how", "items", "s", "peak MiB grown"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Cold start of the three example packages with the import hook of
+# `lazy_examples.py`, against how the examples were loaded before it (parsed
+# and run one statement at a time on every load, as `load_example` did).
+# Every case runs in a fresh interpreter. Cold starts with no bytecode cached
+# for the repository (the standard library's is kept), warm runs again on the
+# cache the cold run left.
+#
+# `python -m benchmarks.bench_lazy_examples`
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._support import ROOT, print_table
+from lazy_examples import examples_in
+
+REPEAT = 5
+PACKAGES = ("basics", "generics", "protocols")
+
+EXAMPLES = [path for package in PACKAGES for path in examples_in(ROOT / package).values()]
+ALIASES = [f"{package}.{alias}" for package in PACKAGES for alias in examples_in(ROOT / package)]
+
+STATEMENT_BY_STATEMENT = f"""
+import ast, types
+for path in {[str(path) for path in EXAMPLES]!r}:
+    module = types.ModuleType(path)
+    for statement in ast.parse(open(path).read(), filename=path).body:
+        try:
+            exec(compile(ast.Module(body=[statement], type_ignores=[]), path, "exec"), module.__dict__)
+        except Exception:
+            pass
+"""
+IMPORT_PACKAGES = "import basics, generics, protocols"
+IMPORT_EXAMPLES = f"""
+import importlib
+modules = [importlib.import_module(name) for name in {ALIASES!r}]
+"""
+RUN_EXAMPLES = IMPORT_EXAMPLES + "\nfor module in modules: vars(module)"
+
+
+def _timed(code: str, cache: str) -> float:
+    # seconds spent in `code`, the interpreter start up isn't counted
+    timed_code = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start, file=__import__('sys').stderr)"
+    environment = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.run(
+        [sys.executable, "-c", timed_code], cwd=ROOT, env=environment, capture_output=True, text=True, check=True,
+    )
+    return float(process.stderr.strip().splitlines()[-1])
+
+
+def _cold_and_warm(code: str, cache: str) -> tuple[float, float]:
+    cold: list[float] = []
+    warm: list[float] = []
+    for _ in range(REPEAT):
+        shutil.rmtree(os.path.join(cache, str(ROOT).lstrip(os.sep)), ignore_errors=True)
+        cold.append(_timed(code, cache))
+        warm.append(_timed(code, cache))
+    return min(cold), min(warm)
+
+
+def main() -> None:
+    cases = [
+        ("before: every example parsed and run", STATEMENT_BY_STATEMENT),
+        ("import the packages", IMPORT_PACKAGES),
+        ("import every example (not run yet)", IMPORT_EXAMPLES),
+        ("import and run every example", RUN_EXAMPLES),
+    ]
+    rows: list[tuple[object, ...]] = []
+    with tempfile.TemporaryDirectory() as cache:
+        _timed(STATEMENT_BY_STATEMENT + RUN_EXAMPLES, cache)  # the standard library is cached from now on
+        for name, code in cases:
+            cold, warm = _cold_and_warm(code, cache)
+            rows.append((name, f"{cold * 1e3:.1f}", f"{warm * 1e3:.1f}"))
+    print_table(f"{len(EXAMPLES)} examples, ms", ("case", "cold cache", "warm cache"), rows)
+
+
+if __name__ == '__main__':
+    main()
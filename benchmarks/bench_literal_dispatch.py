@@ -0,0 +1,79 @@
+# Cost per call of `basics/literal_dispatch.py` against the if/elif chain of
+# `return_value` in `basics/2_functions.py` (and a `match` statement) for 2,
+# 20 and 200 literal values, called with every value in turn. The chains are
+# generated, a hand written one would be the same code.
+#
+# `python -m benchmarks.bench_literal_dispatch`
+from typing import Any, Callable, Literal
+
+from basics.literal_dispatch import LiteralDispatch, literal_dispatch
+from benchmarks._support import best_of, print_table
+
+CASES = (2, 20, 200)
+CALLS = 200_000
+
+
+def _generated(source: str) -> Callable[[str], int]:
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace["dispatch"]  # type: ignore[no-any-return]
+
+
+def if_elif_chain(values: list[str]) -> Callable[[str], int]:
+    lines = ["def dispatch(my_literal):"]
+    for index, value in enumerate(values):
+        lines += [f"    {'if' if index == 0 else 'elif'} my_literal == {value!r}:", f"        return {index}"]
+    return _generated("\n".join(lines))
+
+
+def match_statement(values: list[str]) -> Callable[[str], int]:
+    lines = ["def dispatch(my_literal):", "    match my_literal:"]
+    for index, value in enumerate(values):
+        lines += [f"        case {value!r}:", f"            return {index}"]
+    return _generated("\n".join(lines))
+
+
+def jump_table(values: list[str]) -> LiteralDispatch[str, [], int]:
+    literal = Literal.__getitem__(tuple(values))  # Literal[*values], built at runtime
+    return literal_dispatch(literal, {value: (lambda index=index: index) for index, value in enumerate(values)})
+
+
+def _calls(dispatch: Callable[[str], int], values: list[str]) -> Callable[[], None]:
+    calls = (values * (CALLS // len(values) + 1))[:CALLS]
+
+    def run() -> None:
+        for value in calls:
+            dispatch(value)
+
+    return run
+
+
+def _indexed_calls(table: LiteralDispatch[str, [], int], values: list[str]) -> Callable[[], None]:
+    calls = (values * (CALLS // len(values) + 1))[:CALLS]
+    handlers = table.handlers
+
+    def run() -> None:
+        for value in calls:
+            handlers[value]()
+
+    return run
+
+
+def main() -> None:
+    rows: list[tuple[object, ...]] = []
+    for cases in CASES:
+        values = [f"value_{index}" for index in range(cases)]
+        table = jump_table(values)
+        assert all(if_elif_chain(values)(value) == match_statement(values)(value) == table(value) for value in values)
+        runs = [_calls(dispatch, values) for dispatch in (if_elif_chain(values), match_statement(values), table)]
+        timings = [best_of(run, repeat=3) / CALLS * 1e9 for run in (*runs, _indexed_calls(table, values))]
+        rows.append((cases, *(f"{timing:.0f}" for timing in timings)))
+    print_table(
+        "ns per call, every value called in turn",
+        ("values", "if/elif", "match", "table(value)", "table.handlers[value]()"),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
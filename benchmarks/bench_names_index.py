@@ -0,0 +1,44 @@
+# Repeated `get_names()` calls on `ListOfNames` from `protocols/1_standard.py`
+# against `CachedListOfNames`, with a few renames between calls
+#
+# `python -m benchmarks.bench_names_index`
+from benchmarks._support import best_of, load_example, print_table
+from protocols.names_index import CachedListOfNames, NamedEntity
+
+standard = load_example("protocols/1_standard.py")
+
+SIZE = 200_000
+CALLS = 10
+RENAMES = 100
+
+
+def main() -> None:
+    plain = standard.ListOfNames()
+    cached: CachedListOfNames[NamedEntity] = CachedListOfNames()
+    for index in range(SIZE):
+        plain.add(standard.ValidNamedClass(name=f"name {index}", last_name="last"))
+        cached.add(NamedEntity(name=f"name {index}", last_name="last"))
+
+    def repeated(names_list: object) -> None:
+        for call in range(CALLS):
+            for index in range(0, SIZE, SIZE // RENAMES):
+                names_list.get_at(index).name = f"renamed {call}"  # type: ignore[attr-defined]
+            names_list.get_names()  # type: ignore[attr-defined]
+
+    plain_time = best_of(lambda: repeated(plain), repeat=3)
+    cached_time = best_of(lambda: repeated(cached), repeat=3)
+    lazy_time = best_of(lambda: next(iter(cached.iter_names())))
+
+    print_table(
+        f"{CALLS} get_names() calls over {SIZE:,} names, {RENAMES} renames before each call",
+        ("list", "ms per call"),
+        [
+            ("ListOfNames", f"{plain_time / CALLS * 1e3:.2f}"),
+            ("CachedListOfNames", f"{cached_time / CALLS * 1e3:.2f}"),
+            ("iter_names(), first name", f"{lazy_time * 1e3:.4f}"),
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
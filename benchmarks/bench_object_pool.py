@@ -0,0 +1,72 @@
+# Construct/discard cycles through `PooledFactory` against the plain
+# `Factory.construct_vehicle` of `basics/3_dataclasses.py`, and through
+# `PooledVehicleFactory` against building `Car()` of `protocols/2_custom.py`
+#
+# `python -m benchmarks.bench_object_pool`
+from benchmarks._support import best_of, load_example, print_table
+from generics.object_pool import PooledFactory, PooledVehicleFactory
+
+dataclasses_example = load_example("basics/3_dataclasses.py")
+custom = load_example("protocols/2_custom.py")
+
+CYCLES = 300_000
+LIVE = 64  # vehicles alive at the same time in the simulation
+
+
+def unpooled() -> None:
+    construct, Car = dataclasses_example.Factory.construct_vehicle, dataclasses_example.Car
+    alive = []
+    for _ in range(CYCLES):
+        alive.append(construct(Car, "medium"))
+        if len(alive) == LIVE:
+            alive.clear()
+
+
+def pooled(factory: PooledFactory) -> None:
+    Car = dataclasses_example.Car
+    alive = []
+    for _ in range(CYCLES):
+        alive.append(factory.construct_vehicle(Car, "medium"))
+        if len(alive) == LIVE:
+            for vehicle in alive:
+                factory.release(vehicle)
+            alive.clear()
+
+
+def protocol_unpooled() -> None:
+    Car = custom.Car
+    alive = []
+    for _ in range(CYCLES):
+        alive.append(Car())
+        if len(alive) == LIVE:
+            alive.clear()
+
+
+def protocol_pooled(factory: "PooledVehicleFactory[object]") -> None:
+    alive = []
+    for _ in range(CYCLES):
+        alive.append(factory.construct_vehicle())
+        if len(alive) == LIVE:
+            for vehicle in alive:
+                factory.release(vehicle)
+            alive.clear()
+
+
+def main() -> None:
+    factory = PooledFactory(default_size=LIVE)
+    vehicle_factory = PooledVehicleFactory(custom.Car, max_size=LIVE)
+    rows = [
+        ("Factory.construct_vehicle", best_of(unpooled, repeat=3), "-"),
+        ("PooledFactory", best_of(lambda: pooled(factory), repeat=3), factory.stats),
+        ("Car()", best_of(protocol_unpooled, repeat=3), "-"),
+        ("PooledVehicleFactory", best_of(lambda: protocol_pooled(vehicle_factory), repeat=3), vehicle_factory.pool.stats),
+    ]
+    print_table(
+        f"{CYCLES:,} constructions, {LIVE} alive at a time",
+        ("factory", "constructions/s", "allocations"),
+        [(name, f"{CYCLES / elapsed:,.0f}", stats) for name, elapsed, stats in rows],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# Single and batched clones of `FrozenPerson` against `Person.copy()` from
+# `basics/3_dataclasses.py`
+#
+# `python -m benchmarks.bench_person_copy`
+import copy
+
+from basics.frozen_person import FrozenPerson, copy_many
+from benchmarks._support import best_of, load_example, print_table
+
+dataclasses_example = load_example("basics/3_dataclasses.py")
+Person = dataclasses_example.Person
+
+SINGLE = 200_000
+BATCH = 1_000_000
+
+
+def main() -> None:
+    person = Person(name="Charles", age=21, position=None, weight=73.2)
+    frozen = FrozenPerson(name="Charles", age=21, position=None, weight=73.2)
+    people = [Person(name="Charles", age=age % 90, position=None, weight=73.2) for age in range(BATCH)]
+    frozen_people = [FrozenPerson(name="Charles", age=age % 90, position=None, weight=73.2) for age in range(BATCH)]
+
+    def single(function: object) -> str:
+        elapsed = best_of(lambda: [function() for _ in range(SINGLE)])  # type: ignore[operator]
+        return f"{elapsed / SINGLE * 1e9:.0f}"
+
+    print_table(
+        "single clone (ns per clone)",
+        ("clone", "ns"),
+        [
+            ("Person.copy()", single(person.copy)),
+            ("copy.copy(Person)", single(lambda: copy.copy(person))),
+            ("FrozenPerson.copy()", single(frozen.copy)),
+            ("FrozenPerson.replace(age=22)", single(lambda: frozen.replace(age=22))),
+        ],
+    )
+
+    batch_rows = [
+        ("[p.copy() for p in list[Person]]", best_of(lambda: [p.copy() for p in people], repeat=3)),
+        ("copy_many(list[FrozenPerson])", best_of(lambda: copy_many(frozen_people), repeat=3)),
+    ]
+    print_table(
+        f"batch of {BATCH:,} clones",
+        ("clone", "ms"),
+        [(name, f"{elapsed * 1e3:.1f}") for name, elapsed in batch_rows],
+    )
+
+
+if __name__ == '__main__':
+    main()
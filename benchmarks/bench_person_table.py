@@ -0,0 +1,53 @@
+# Memory, `age > 30` filter and mean weight of a `PersonTable` against a plain
+# `list[Person]` built from `basics/3_dataclasses.py`
+#
+# `python -m benchmarks.bench_person_table`
+import random
+from typing import Any
+
+from basics.person_table import PersonTable
+from benchmarks._support import allocated_bytes, best_of, load_example, print_table
+
+dataclasses_example = load_example("basics/3_dataclasses.py")
+Person = dataclasses_example.Person
+
+SIZE = 500_000
+NAMES = ["Charles", "Xavier", "Jean", "Scott", "Ororo", "Logan", "Hank", "Kurt"]
+POSITIONS = [None, "professor", "student", "pilot"]
+
+
+def make_people() -> list[Any]:
+    # a parser would give us a new str object per record, `join` does the same here
+    return [
+        Person(
+            name="".join(random.choice(NAMES)),
+            age=random.randrange(18, 80),
+            position=random.choice(POSITIONS),
+            weight=random.uniform(50, 110),
+        )
+        for _ in range(SIZE)
+    ]
+
+
+def main() -> None:
+    random.seed(0)
+    people, list_size = allocated_bytes(make_people)
+    table, table_size = allocated_bytes(lambda: PersonTable(people))
+
+    list_filter = best_of(lambda: [person for person in people if person.age > 30])
+    table_filter = best_of(lambda: table.where("age", ">", 30))
+    list_mean = best_of(lambda: sum(person.weight for person in people) / len(people))
+    table_mean = best_of(lambda: table.mean("weight"))
+
+    print_table(
+        f"{SIZE:,} people",
+        ("storage", "bytes/person", "age > 30 (ms)", "mean weight (ms)"),
+        [
+            ("list[Person]", f"{list_size / SIZE:.1f}", f"{list_filter * 1e3:.1f}", f"{list_mean * 1e3:.1f}"),
+            ("PersonTable", f"{table_size / SIZE:.1f}", f"{table_filter * 1e3:.1f}", f"{table_mean * 1e3:.1f}"),
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# Cost of `generics/pipeline.py` against hand written loops for cheap steps,
+# against `multiprocessing.Pool.map` for CPU bound work, and threads against
+# a loop for I/O bound work (a sleep standing for a request)
+#
+# `python -m benchmarks.bench_pipeline`
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import Pool
+from typing import Union
+
+from benchmarks._support import best_of, print_table
+from generics.pipeline import ExecutorKind, Pipeline
+
+CHEAP_ITEMS = 1_000_000
+CPU_ITEMS = 20_000
+IO_ITEMS = 400
+PROCESSES = os.cpu_count() or 1
+THREADS = 32
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def is_odd(value: int) -> bool:
+    return value % 2 == 1
+
+
+def collatz_steps(value: int) -> int:
+    steps = 0
+    value += 1
+    while value != 1:
+        value = value // 2 if value % 2 == 0 else 3 * value + 1
+        steps += 1
+    return steps
+
+
+def fetch(value: int) -> int:
+    time.sleep(0.001)
+    return value
+
+
+def cheap_loop() -> int:
+    total = 0
+    for value in range(CHEAP_ITEMS):
+        if value % 2 == 1:
+            total += value * value
+    return total
+
+
+def cheap_pipeline() -> int:
+    return Pipeline(range(CHEAP_ITEMS)).filter(is_odd).map(square).reduce(lambda total, value: total + value, 0)
+
+
+def cheap_pipeline_sum() -> int:
+    return sum(Pipeline(range(CHEAP_ITEMS)).filter(is_odd).map(square))
+
+
+def main() -> None:
+    assert cheap_loop() == cheap_pipeline() == cheap_pipeline_sum()
+    print_table(f"filter, map and sum of {CHEAP_ITEMS:,} ints (ms)", ("how", "ms"), [
+        ("for loop", f"{best_of(cheap_loop, 3) * 1e3:.0f}"),
+        ("Pipeline ... .reduce", f"{best_of(cheap_pipeline, 3) * 1e3:.0f}"),
+        ("sum(Pipeline ...)", f"{best_of(cheap_pipeline_sum, 3) * 1e3:.0f}"),
+    ])
+
+    chunksize = max(1, CPU_ITEMS // (PROCESSES * 8))
+    expected = [collatz_steps(value) for value in range(CPU_ITEMS)]
+    with Pool(PROCESSES) as pool:
+        pool_map = best_of(lambda: pool.map(collatz_steps, range(CPU_ITEMS), chunksize), 3)
+
+    def parallel(ordered: bool, executor: Union[ExecutorKind, Executor] = "process") -> list[int]:
+        pipeline = Pipeline(range(CPU_ITEMS)).parallel(
+            collatz_steps, workers=PROCESSES, executor=executor, ordered=ordered, chunksize=chunksize,
+        )
+        return pipeline.collect()
+
+    assert parallel(True) == expected and sorted(parallel(False)) == sorted(expected)
+    with ProcessPoolExecutor(PROCESSES) as executor:
+        parallel(True, executor)  # the workers are started
+        on_open_pool = best_of(lambda: parallel(True, executor), 3)
+    print_table(f"collatz steps of {CPU_ITEMS:,} ints on {PROCESSES} processes (ms)", ("how", "ms"), [
+        ("list comprehension", f"{best_of(lambda: [collatz_steps(value) for value in range(CPU_ITEMS)], 3) * 1e3:.0f}"),
+        ("Pool.map on an open pool", f"{pool_map * 1e3:.0f}"),
+        ("Pipeline.parallel on an open executor", f"{on_open_pool * 1e3:.0f}"),
+        ("Pipeline.parallel ordered, new pool", f"{best_of(lambda: parallel(True), 3) * 1e3:.0f}"),
+        ("Pipeline.parallel unordered, new pool", f"{best_of(lambda: parallel(False), 3) * 1e3:.0f}"),
+    ])
+
+    print_table(f"{IO_ITEMS} calls sleeping 1 ms (ms)", ("how", "ms"), [
+        ("for loop", f"{best_of(lambda: [fetch(value) for value in range(IO_ITEMS)], 3) * 1e3:.0f}"),
+        (f"Pipeline.parallel {THREADS} threads",
+         f"{best_of(lambda: Pipeline(range(IO_ITEMS)).parallel(fetch, workers=THREADS).collect(), 3) * 1e3:.0f}"),
+        ("... unordered",
+         f"{best_of(lambda: Pipeline(range(IO_ITEMS)).parallel(fetch, THREADS, ordered=False).collect(), 3) * 1e3:.0f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main()
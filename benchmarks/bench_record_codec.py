@@ -0,0 +1,68 @@
+# Size and throughput of `basics/record_codec.py` for a batch of `UserTuple`
+# records of `basics/1_variables.py`, against pickle and JSON, plus random
+# access by row to a memory mapped file
+#
+# `python -m benchmarks.bench_record_codec`
+import json
+import os
+import pickle
+import random
+import tempfile
+from typing import Any
+
+from basics.record_codec import codec_for
+from benchmarks._support import best_of, load_example, print_table
+
+variables_example = load_example("basics/1_variables.py")
+UserTuple: Any = variables_example.UserTuple
+
+RECORDS = 1_000_000
+RANDOM_READS = 100_000
+
+
+def main() -> None:
+    random.seed(0)
+    users = [UserTuple(f"user {index}", random.randrange(18, 99)) for index in range(RECORDS)]
+    codec = codec_for(UserTuple)
+
+    pickled = pickle.dumps(users, protocol=pickle.HIGHEST_PROTOCOL)
+    as_json = json.dumps(users).encode()  # NamedTuples become arrays
+    encoded = codec.encode(users)
+    assert codec.decode(encoded) == users
+
+    cases = [
+        ("pickle", pickled, lambda: pickle.dumps(users, protocol=pickle.HIGHEST_PROTOCOL),
+         lambda: pickle.loads(pickled)),
+        ("json", as_json, lambda: json.dumps(users).encode(),
+         lambda: [UserTuple(*row) for row in json.loads(as_json)]),
+        ("RecordCodec", encoded, lambda: codec.encode(users), lambda: codec.decode(encoded)),
+    ]
+    rows: list[tuple[object, ...]] = []
+    for name, data, encode, decode in cases:
+        encode_seconds = best_of(encode, repeat=3)
+        decode_seconds = best_of(decode, repeat=3)
+        rows.append((
+            name,
+            f"{len(data) / 2 ** 20:.1f}",
+            f"{encode_seconds * 1e3:.0f}",
+            f"{decode_seconds * 1e3:.0f}",
+            f"{RECORDS / decode_seconds / 1e6:.1f}",
+        ))
+    print_table(
+        f"{RECORDS:,} UserTuple records",
+        ("format", "MiB", "encode ms", "decode ms", "M records/s decoded"),
+        rows,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "users.bin")
+        codec.write(path, users)
+        indices = [random.randrange(RECORDS) for _ in range(RANDOM_READS)]
+        with codec.open(path) as records:
+            assert all(records[index] == users[index] for index in indices[:1_000])
+            elapsed = best_of(lambda: [records[index] for index in indices], repeat=3)
+        print(f"\n{RANDOM_READS:,} random rows from the memory mapped file: {elapsed / RANDOM_READS * 1e9:.0f} ns each")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# Rolling window of the last events with `generics/ring_buffer.py` against
+# a list trimmed by slicing (as with `MyListHandler` today) and a
+# `collections.deque(maxlen=...)`: throughput, latency of single appends and
+# memory of the window. Then `SPSCQueue` against `queue.Queue` between a
+# producer and a consumer thread.
+#
+# `python -m benchmarks.bench_ring_buffer`
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from benchmarks._support import allocated_bytes, best_of, print_table
+from generics.ring_buffer import RingBuffer, SPSCQueue
+
+EVENTS = 1_000_000
+WINDOW = 1_000
+LATENCY_SAMPLES = 200_000
+HANDOFFS = 200_000
+
+
+class SlicedList:
+    # the window as it is kept today, a list cut back to its last items
+    __slots__ = ("items",)
+
+    def __init__(self) -> None:
+        self.items: list[float] = []
+
+    def append(self, value: float) -> None:
+        self.items.append(value)
+        self.items = self.items[-WINDOW:]
+
+
+def _windows() -> list[tuple[str, Callable[[], Any]]]:
+    return [
+        ("list + slice", SlicedList),
+        ("deque(maxlen)", lambda: deque(maxlen=WINDOW)),
+        ("RingBuffer list", lambda: RingBuffer(WINDOW)),
+        ("RingBuffer array('d')", lambda: RingBuffer(WINDOW, float)),
+    ]
+
+
+def _throughput(new_window: Callable[[], Any]) -> float:
+    values = [float(value) for value in range(EVENTS)]
+
+    def run() -> None:
+        append = new_window().append
+        for value in values:
+            append(value)
+
+    return EVENTS / best_of(run, repeat=3)
+
+
+def _latencies(new_window: Callable[[], Any]) -> list[int]:
+    window = new_window()
+    append, clock = window.append, time.perf_counter_ns
+    for value in range(WINDOW):
+        append(float(value))  # full, every append from now on evicts
+    samples = []
+    for value in range(LATENCY_SAMPLES):
+        start = clock()
+        append(float(value))
+        samples.append(clock() - start)
+    return sorted(samples)
+
+
+def _window_bytes(new_window: Callable[[], Any]) -> int:
+    def filled() -> Any:
+        window = new_window()
+        for value in range(WINDOW):
+            window.append(value + 0.5)  # floats made here are counted too
+        return window
+
+    return allocated_bytes(filled)[1]
+
+
+def _handoff(put: Callable[[int], None], get: Callable[[], int]) -> float:
+    def produce() -> None:
+        for value in range(HANDOFFS):
+            put(value)
+
+    def consume() -> None:
+        for _ in range(HANDOFFS):
+            get()
+
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rows: list[tuple[object, ...]] = []
+    for name, new_window in _windows():
+        samples = _latencies(new_window)
+        rows.append((
+            name,
+            f"{_throughput(new_window) / 1e6:.2f}",
+            samples[len(samples) // 2],
+            samples[len(samples) * 99 // 100],
+            f"{_window_bytes(new_window) / 1024:.1f}",
+        ))
+    print_table(
+        f"window of the last {WINDOW:,} of {EVENTS:,} events",
+        ("window", "M appends/s", "p50 ns", "p99 ns", "KiB held"),
+        rows,
+    )
+
+    standard: queue.Queue[int] = queue.Queue(WINDOW)
+    spsc: SPSCQueue[int] = SPSCQueue(WINDOW)
+    print_table(f"{HANDOFFS:,} ints from a producer to a consumer thread", ("queue", "ms"), [
+        ("queue.Queue", f"{_handoff(standard.put, standard.get) * 1e3:.0f}"),
+        ("SPSCQueue", f"{_handoff(spsc.put, spsc.get) * 1e3:.0f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# `top_k`, `iter_sorted` and `external_sorted` of `basics/sorting.py` against
+# sorting every value with `sort_keys` of `basics/2_functions.py`, in time and
+# peak memory
+#
+# `python -m benchmarks.bench_sorting`
+import random
+import tracemalloc
+from itertools import islice
+from typing import Callable
+
+from basics.sorting import external_sorted, iter_sorted, top_k
+from benchmarks._support import best_of, load_example, print_table
+
+functions_example = load_example("basics/2_functions.py")
+
+SIZE = 1_000_000
+K = 10
+
+
+def _peak_bytes(function: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    random.seed(0)
+    my_dict = {f"key_{index}": random.random() for index in range(SIZE)}
+    sort_keys: Callable[[dict[str, float]], list[float]] = functions_example.sort_keys
+
+    cases: list[tuple[str, Callable[[], object]]] = [
+        (f"sort_keys(my_dict)[-{K}:]", lambda: sort_keys(my_dict)[-K:]),
+        (f"top_k(values, {K})", lambda: top_k(my_dict.values(), K)),
+        (f"first {K} of iter_sorted(values)", lambda: list(islice(iter_sorted(my_dict.values()), K))),
+        ("sorted(values)", lambda: sorted(my_dict.values())),
+        ("list(external_sorted(values))", lambda: list(external_sorted(my_dict.values(), max_in_memory=100_000))),
+        (f"first {K} of external_sorted(values)",
+         lambda: list(islice(external_sorted(my_dict.values(), max_in_memory=100_000), K))),
+    ]
+    print_table(
+        f"{SIZE:,} float values",
+        ("how", "ms", "peak MiB"),
+        [
+            (name, f"{best_of(function, repeat=3) * 1e3:.1f}", f"{_peak_bytes(function) / 2 ** 20:.1f}")
+            for name, function in cases
+        ],
+    )
+
+
+if __name__ == '__main__':
+    main()
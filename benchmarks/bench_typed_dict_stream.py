@@ -0,0 +1,90 @@
+# Records per second of `validate_stream` on generated NDJSON and JSON array
+# files of `MyUserDict` records, one in ten of them invalid. Then the peak
+# memory of reading a JSON array whose second element is malformed JSON,
+# which should be reported and skipped rather than read the rest of the
+# file into one buffer.
+#
+# `python -m benchmarks.bench_typed_dict_stream`
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from basics.typed_dict_stream import InvalidRecord, validate_stream
+from benchmarks._support import load_example, print_table
+
+typed_dict_example = load_example("basics/1_2_typed_dict.py")
+MyUserDict = typed_dict_example.MyUserDict
+
+SIZE = 500_000
+
+
+def write_files(directory: Path) -> tuple[Path, Path]:
+    records = [
+        typed_dict_example.invalid_user_dict_3 if index % 10 == 0
+        else {"name": "Carlos", "age": index % 90, "extra_info": {"birthday": "sunday"}}
+        for index in range(SIZE)
+    ]
+    ndjson, array = directory / "users.ndjson", directory / "users.json"
+    with ndjson.open("w") as file:
+        file.writelines(json.dumps(record) + "\n" for record in records)
+    with array.open("w") as file:
+        json.dump(records, file)
+    return ndjson, array
+
+
+def write_malformed(directory: Path) -> Path:
+    array = directory / "malformed.json"
+    with array.open("w") as file:
+        file.write('[{"name": "Carlos", "age": 15}, {"name": "Carlos", "age": 15,,}')
+        file.writelines(', {"name": "Carlos", "age": 15}' for _ in range(SIZE))
+        file.write("]")
+    return array
+
+
+def peak_memory(path: Path) -> tuple[int, list[InvalidRecord], int]:
+    rejected: list[InvalidRecord] = []
+    tracemalloc.start()
+    try:
+        valid = sum(1 for _ in validate_stream(path, MyUserDict, on_invalid=rejected.append))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return valid, rejected, peak
+
+
+def measure(path: Path, workers: int) -> tuple[float, int, int]:
+    rejected: list[InvalidRecord] = []
+    start = time.perf_counter()
+    valid = sum(1 for _ in validate_stream(path, MyUserDict, on_invalid=rejected.append, workers=workers))
+    return time.perf_counter() - start, valid, len(rejected)
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        ndjson, array = write_files(Path(directory))
+        rows: list[tuple[object, ...]] = []
+        for name, path, workers in (
+                ("NDJSON", ndjson, 1),
+                ("NDJSON", ndjson, cores),
+                ("JSON array", array, 1),
+        ):
+            elapsed, valid, rejected = measure(path, workers)
+            rows.append((name, workers, f"{valid:,}", f"{rejected:,}", f"{SIZE / elapsed:,.0f}"))
+        malformed = write_malformed(Path(directory))
+        file_size = malformed.stat().st_size
+        valid, invalid, peak = peak_memory(malformed)
+
+    print_table(f"{SIZE:,} MyUserDict records", ("format", "workers", "valid", "invalid", "records/s"), rows)
+    print_table(
+        f"JSON array of {file_size / 2 ** 20:.1f} MiB, its second element malformed",
+        ("valid", "invalid at", "peak MiB traced"),
+        [(f"{valid:,}", [record.position for record in invalid], f"{peak / 2 ** 20:.2f}")],
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Compiled `validator_for(schema)` against a naive validator that calls
+# `get_type_hints` and walks the annotations on every payload
+#
+# `python -m benchmarks.bench_typed_dict_validator`
+from typing import Any, Union, get_args, get_origin, get_type_hints, is_typeddict
+
+from basics.typed_dict_validator import validator_for
+from benchmarks._support import best_of, load_example, print_table
+
+typed_dict_example = load_example("basics/1_2_typed_dict.py")
+MyUserDict = typed_dict_example.MyUserDict
+PersonDict = typed_dict_example.PersonDict
+
+SIZE = 1_000_000
+
+
+def naive_is_valid(value: Any, annotation: Any) -> bool:
+    if is_typeddict(annotation):
+        if not isinstance(value, dict):
+            return False
+        hints = get_type_hints(annotation)
+        if any(key not in hints for key in value) or any(key not in value for key in annotation.__required_keys__):
+            return False
+        return all(naive_is_valid(item, hints[key]) for key, item in value.items())
+    origin = get_origin(annotation)
+    if origin is Union:
+        return any(naive_is_valid(value, member) for member in get_args(annotation))
+    if origin is list:
+        return isinstance(value, list) and all(naive_is_valid(item, get_args(annotation)[0]) for item in value)
+    if annotation is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, annotation)
+
+
+def main() -> None:
+    users = [{"name": "Carlos", "age": age % 90, "extra_info": {"birthday": "sunday"}} for age in range(SIZE)]
+    people = [
+        {"name": "Charles", "last_name": "Xavier", "height": 1.75, "friends": [{"name": "Jean", "last_name": "Grey", "height": 1.68}]}
+        for _ in range(SIZE // 10)
+    ]
+
+    rows: list[tuple[object, ...]] = []
+    for schema, payloads in ((MyUserDict, users), (PersonDict, people)):
+        validator = validator_for(schema)
+        naive = best_of(lambda: [naive_is_valid(payload, schema) for payload in payloads], repeat=1)
+        compiled = best_of(lambda: [validator.is_valid(payload) for payload in payloads], repeat=3)
+        rows.append((
+            schema.__name__,
+            f"{len(payloads):,}",
+            f"{len(payloads) / naive / 1e3:,.0f}",
+            f"{len(payloads) / compiled / 1e3:,.0f}",
+            f"{naive / compiled:.1f}x",
+        ))
+
+    print_table(
+        "TypedDict validation (thousands of dicts per second)",
+        ("schema", "dicts", "naive", "compiled", "speedup"),
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
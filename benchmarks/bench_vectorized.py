@@ -0,0 +1,56 @@
+# The batch `sum_of`, `average` and `multiply` of `basics/vectorized.py` for
+# lists, `array.array` and NumPy arrays of growing size, against calling the
+# scalar functions of `basics/2_functions.py` once per value
+#
+# `python -m benchmarks.bench_vectorized`
+from array import array
+from typing import Any, Callable
+
+from basics.vectorized import average, multiply, np, sum_of
+from benchmarks._support import best_of, load_example, print_table
+
+functions_example = load_example("basics/2_functions.py")
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def _backends(size: int) -> dict[str, Any]:
+    values = list(range(size))
+    backends: dict[str, Any] = {"list": values, "array": array("q", values)}
+    if np is not None:
+        backends["numpy"] = np.arange(size, dtype=np.int64)
+    return backends
+
+
+def main() -> None:
+    scalar_multiply: Callable[[int, int], int] = functions_example.multiply
+    sum_tuple: Callable[[tuple[int, ...]], int] = functions_example.sum_tuple
+    average_of: Callable[..., float] = functions_example.average_of
+
+    for size in SIZES:
+        values = list(range(size))
+        repeat = 5 if size < 1_000_000 else 3
+        rows = [
+            (
+                "scalar functions",
+                best_of(lambda: [scalar_multiply(value, 3) for value in values], repeat),
+                best_of(lambda: sum_tuple(tuple(values)), repeat),
+                best_of(lambda: average_of(*values), repeat),
+            ),
+        ]
+        for backend, batch in _backends(size).items():
+            rows.append((
+                backend,
+                best_of(lambda: multiply(batch, 3), repeat),
+                best_of(lambda: sum_of(batch), repeat),
+                best_of(lambda: average(batch), repeat),
+            ))
+        print_table(
+            f"{size:,} values (ms)",
+            ("backend", "multiply by 3", "sum", "average"),
+            [(name, *(f"{elapsed * 1e3:.3f}" for elapsed in timings)) for name, *timings in rows],
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+# Runtime cost of the constructs the examples teach: creating and reading a
+# `@dataclass`, the `UserTuple` NamedTuple and a TypedDict, instantiating a
+# `Generic[T]` subclass (`MyListHandler[Test]()`), `isinstance` against a
+# Protocol and calling an `@overload`ed function. Every case is a callable
+# without arguments, so it can be handed to pytest-benchmark's `benchmark`
+# fixture or to pyperf as is.
+#
+# Results can be saved as JSON and compared against a saved baseline, to
+# catch slowdowns after a Python upgrade. The exit status is 1 when a case
+# got slower than the threshold.
+#
+# `python -m benchmarks.suite [--filter create]`
+# `python -m benchmarks.suite --save`                      benchmarks/baseline.json
+# `python -m benchmarks.suite --compare [--threshold 0.1]` against it
+# `python -m benchmarks.suite --output results.json --compare other.json`
+# `python -m benchmarks.suite --pyperf [pyperf options]`   needs pyperf installed
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Generic, NamedTuple, Optional, TypeVar, runtime_checkable
+
+from basics.literal_dispatch import return_value_3
+from benchmarks._support import ROOT, load_example, print_table
+from protocols.conformance import checker_for
+
+try:
+    import pyperf  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pyperf is optional, the suite has its own timer
+    pyperf = None
+
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+FORMAT_VERSION = 1
+
+T = TypeVar("T")
+
+Case = Callable[[], object]
+
+
+class Result(NamedTuple):
+    best_ns: float
+    median_ns: float
+    loops: int
+
+
+@dataclass
+class UserData:
+    name: str
+    age: int
+
+
+@dataclass(slots=True)
+class SlotsUserData:
+    name: str
+    age: int
+
+
+class PlainListHandler:
+    # `MyListHandler` without `Generic`
+
+    def __init__(self) -> None:
+        self.my_list: list[Any] = []
+
+
+class AbstractBarker(ABC):
+
+    @abstractmethod
+    def bark(self) -> None: ...
+
+
+class AbcDog(AbstractBarker):
+
+    def bark(self) -> None:
+        print("woof")
+
+
+class Box(Generic[T]):
+    # `Box[int](1)` tries to set `__orig_class__` on the instance, with slots that fails (and typing ignores it)
+    __slots__ = ("value",)
+
+    def __init__(self, value: T) -> None:
+        self.value = value
+
+
+def cases() -> dict[str, Case]:
+    variables = load_example("basics/1_variables.py")
+    functions = load_example("basics/2_functions.py")
+    own_generics = load_example("generics/2_own_generics.py")
+    standard = load_example("protocols/1_standard.py")
+    UserTuple, MyUserDict = variables.UserTuple, variables.MyUserDict
+    MyListHandler, Test = own_generics.MyListHandler, own_generics.Test
+    Barker = runtime_checkable(standard.Barker)
+    dog, person, abc_dog = standard.Dog(), standard.Person(), AbcDog()
+    user_data, user_tuple, user_dict = UserData("Carlos", 15), UserTuple("Carlos", 15), MyUserDict(name="Carlos", age=15)
+    conforms = checker_for(Barker)
+
+    return {
+        "call overhead": lambda: None,  # every case pays it too
+        "create/dataclass": lambda: UserData("Carlos", 15),
+        "create/dataclass slots": lambda: SlotsUserData("Carlos", 15),
+        "create/NamedTuple": lambda: UserTuple("Carlos", 15),
+        "create/TypedDict call": lambda: MyUserDict(name="Carlos", age=15),
+        "create/TypedDict literal": lambda: {"name": "Carlos", "age": 15},
+        "access/dataclass": lambda: user_data.name,
+        "access/NamedTuple field": lambda: user_tuple.name,
+        "access/NamedTuple index": lambda: user_tuple[0],
+        "access/TypedDict key": lambda: user_dict["name"],
+        "generic/MyListHandler[Test]()": lambda: MyListHandler[Test](),
+        "generic/MyListHandler()": lambda: MyListHandler(),
+        "generic/plain class()": lambda: PlainListHandler(),
+        "generic/Box[int](1) slots": lambda: Box[int](1),
+        "generic/Box(1) slots": lambda: Box(1),
+        "protocol/isinstance match": lambda: isinstance(dog, Barker),
+        "protocol/isinstance no match": lambda: isinstance(person, Barker),
+        "protocol/checker_for match": lambda: conforms(dog),
+        "protocol/isinstance ABC": lambda: isinstance(abc_dog, AbstractBarker),
+        "protocol/isinstance class": lambda: isinstance(dog, standard.Dog),
+        "overload/return_value": lambda: functions.return_value("string"),
+        "overload/return_value_2 (@overload)": lambda: functions.return_value_2("string"),
+        "overload/return_value_3 (literal_dispatch)": lambda: return_value_3("string"),
+    }
+
+
+def measure(case: Case, repeat: int = 5) -> Result:
+    # as `python -m timeit`: enough loops for ~0.2 s, then the best and median of `repeat` runs
+    timer = timeit.Timer(case)
+    loops, _ = timer.autorange()
+    loops = max(1, loops)
+    timings = [timing / loops * 1e9 for timing in timer.repeat(repeat=repeat, number=loops)]
+    return Result(min(timings), statistics.median(timings), loops)
+
+
+def run(selected: dict[str, Case]) -> dict[str, Result]:
+    return {name: measure(case) for name, case in selected.items()}
+
+
+def metadata() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def save(path: Path, results: dict[str, Result]) -> None:
+    payload = {
+        "version": FORMAT_VERSION,
+        "metadata": metadata(),
+        "results": {name: result._asdict() for name, result in results.items()},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def load(path: Path) -> tuple[dict[str, str], dict[str, Result]]:
+    payload = json.loads(path.read_text())
+    if payload.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} was saved by another version of the suite")
+    return payload["metadata"], {name: Result(**values) for name, values in payload["results"].items()}
+
+
+def compare(
+        baseline: dict[str, Result],
+        current: dict[str, Result],
+        threshold: float,
+) -> tuple[list[tuple[object, ...]], list[str]]:
+    # the best timings are compared, they are the least affected by a noisy machine
+    rows: list[tuple[object, ...]] = []
+    regressions: list[str] = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, "-", f"{result.best_ns:.1f}", "new"))
+            continue
+        change = result.best_ns / before.best_ns - 1
+        verdict = "slower" if change > threshold else "faster" if change < -threshold else ""
+        if verdict == "slower":
+            regressions.append(name)
+        rows.append((name, f"{before.best_ns:.1f}", f"{result.best_ns:.1f}", f"{change:+.1%} {verdict}".rstrip()))
+    return rows, regressions
+
+
+def _run_pyperf(selected: dict[str, Case]) -> None:
+    # pyperf parses the command line itself and spawns workers running this same module
+    if pyperf is None:
+        sys.exit("pyperf is not installed, `pip install pyperf` or run without --pyperf")
+    sys.argv.remove("--pyperf")
+    runner = pyperf.Runner(program_args=("-m", "benchmarks.suite", "--pyperf"))
+    for name, case in selected.items():
+        runner.bench_func(name, case)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    if "--pyperf" in sys.argv:
+        _run_pyperf(cases())
+        return 0
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="only the cases whose name contains it")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--save", type=Path, nargs="?", const=BASELINE, help="save the results as the baseline")
+    parser.add_argument("--compare", type=Path, nargs="?", const=BASELINE, help="compare with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that fails the run")
+    arguments = parser.parse_args(argv)
+
+    selected = {name: case for name, case in cases().items() if arguments.filter in name}
+    results = run(selected)
+    print_table(
+        f"Python {platform.python_version()}, ns per call",
+        ("case", "best", "median", "loops"),
+        [(name, f"{result.best_ns:.1f}", f"{result.median_ns:.1f}", result.loops) for name, result in results.items()],
+    )
+    for path in (arguments.output, arguments.save):
+        if path is not None:
+            save(path, results)
+            print(f"\nresults saved to {path}")
+
+    if arguments.compare is None:
+        return 0
+    baseline_metadata, baseline = load(arguments.compare)
+    rows, regressions = compare(baseline, results, arguments.threshold)
+    print_table(
+        f"against {arguments.compare} (Python {baseline_metadata['python']}, {baseline_metadata['date']})",
+        ("case", "baseline ns", "now ns", "change"),
+        rows,
+    )
+    if regressions:
+        print(f"\n{len(regressions)} cases more than {arguments.threshold:.0%} slower: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `MyListHandler[T]` (see `2_own_generics.py`) keeps every element as a   #
+#  full python object inside a `list`. When `T` is a primitive numeric     #
+#  type we can store the raw values instead, either in an `array.array`    #
+#  or, when it is installed and requested, in a NumPy array.               #
+#                                                                          #
+#  `ArrayListHandler` takes the element type as a value since type         #
+#  parameters are erased at runtime, i.e.                                  #
+#                                                                          #
+#  `ArrayListHandler(int)`   -> ArrayListHandler[int], backed by array('q')#
+#  `ArrayListHandler(Test)`  -> ArrayListHandler[Test], backed by a list   #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from array import array
+from typing import Any, ClassVar, Generic, Iterable, Iterator, Literal, Sequence, Type, TypeVar, Union, overload
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # NumPy is optional, `array.array` covers the same types
+    np = None  # type: ignore[assignment, unused-ignore]
+
+T = TypeVar("T")
+
+Backend = Literal["auto", "array", "numpy", "list"]
+
+# bool is left out on purpose, array('b') would give us back ints instead of bools
+TYPECODES: dict[type, str] = {int: "q", float: "d"}
+
+
+class ArrayListHandler(Generic[T]):
+    # Calling `ArrayListHandler(...)` gives back one of the storage specific
+    # subclasses below, so `add` and `get_at` never branch on the backend.
+    __slots__ = ("item_type", "_storage")
+
+    item_type: Type[T]
+    _storage: Any
+    backend: ClassVar[Backend]  # set by each storage class
+
+    def __new__(cls, item_type: Type[T], backend: Backend = "auto") -> "ArrayListHandler[T]":
+        if cls is not ArrayListHandler:
+            return super().__new__(cls)
+        if backend == "auto":
+            backend = "array" if item_type in TYPECODES else "list"
+        if backend != "list" and item_type not in TYPECODES:
+            raise TypeError(f"{backend!r} storage only supports {list(TYPECODES)}, not {item_type!r}")
+        if backend == "numpy" and np is None:
+            raise ImportError("the 'numpy' backend requires NumPy to be installed")
+        storage_class = {"list": _ListStorage, "array": _ArrayStorage, "numpy": _NumpyStorage}[backend]
+        return super().__new__(storage_class)
+
+    def __init__(self, item_type: Type[T], backend: Backend = "auto") -> None:
+        self.item_type = item_type
+
+    def add(self, val: T) -> None:
+        self._storage.append(val)
+
+    def extend(self, values: Iterable[T]) -> None:
+        self._storage.extend(values)
+
+    def get_at(self, index: int) -> T:
+        return self._storage[index]  # type: ignore[no-any-return]
+
+    def get_many(self, indices: Iterable[int]) -> list[T]:
+        storage = self._storage
+        return [storage[index] for index in indices]
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ListHandlerView[T]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, "ListHandlerView[T]"]:
+        if isinstance(index, slice):
+            return ListHandlerView(self, range(len(self))[index])
+        return self.get_at(index)
+
+    def __len__(self) -> int:
+        return len(self._storage)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._storage)
+
+
+class _ListStorage(ArrayListHandler[T]):
+    __slots__ = ()
+    backend = "list"
+
+    _storage: list[T]
+
+    def __init__(self, item_type: Type[T], backend: Backend = "auto") -> None:
+        super().__init__(item_type)
+        self._storage = []
+
+
+class _ArrayStorage(ArrayListHandler[T]):
+    __slots__ = ()
+    backend = "array"
+
+    _storage: "array[Any]"
+
+    def __init__(self, item_type: Type[T], backend: Backend = "auto") -> None:
+        super().__init__(item_type)
+        self._storage = array(TYPECODES[item_type])
+
+
+class _NumpyStorage(ArrayListHandler[T]):
+    # NumPy arrays can't grow in place, so we keep some spare capacity and
+    # double it when it runs out, the same way `list` does internally
+    __slots__ = ("_length",)
+    backend = "numpy"
+
+    def __init__(self, item_type: Type[T], backend: Backend = "auto") -> None:
+        super().__init__(item_type)
+        self._storage = np.empty(16, dtype=np.int64 if item_type is int else np.float64)
+        self._length = 0
+
+    def add(self, val: T) -> None:
+        if self._length == len(self._storage):
+            self._storage = np.resize(self._storage, 2 * len(self._storage))
+        self._storage[self._length] = val
+        self._length += 1
+
+    def extend(self, values: Iterable[T]) -> None:
+        new_values = np.fromiter(values, dtype=self._storage.dtype)
+        needed = self._length + len(new_values)
+        if needed > len(self._storage):
+            self._storage = np.resize(self._storage, max(needed, 2 * len(self._storage)))
+        self._storage[self._length:needed] = new_values
+        self._length = needed
+
+    def get_at(self, index: int) -> T:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("list index out of range")
+        return self._storage[index].item()  # type: ignore[no-any-return]
+
+    def get_many(self, indices: Iterable[int]) -> list[T]:
+        # fancy indexing gathers every element in a single vectorized call
+        return self._storage[:self._length][np.fromiter(indices, dtype=np.intp)].tolist()  # type: ignore[no-any-return]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._storage[:self._length].tolist())
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Slicing a handler gives a view that only keeps a reference to the       #
+#  handler and a `range` of indices, so nothing is copied. We don't hand   #
+#  out a `memoryview` because exporting the buffer of an `array.array`     #
+#  forbids resizing it, and `add` would raise a `BufferError` afterwards.  #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+
+class ListHandlerView(Sequence[T]):
+    __slots__ = ("_handler", "_indices")
+
+    def __init__(self, handler: ArrayListHandler[T], indices: range) -> None:
+        self._handler = handler
+        self._indices = indices
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ListHandlerView[T]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, "ListHandlerView[T]"]:
+        if isinstance(index, slice):
+            return ListHandlerView(self._handler, self._indices[index])
+        return self._handler.get_at(self._indices[index])
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __iter__(self) -> Iterator[T]:
+        get_at = self._handler.get_at
+        return (get_at(index) for index in self._indices)
+
+    def to_list(self) -> list[T]:
+        return self._handler.get_many(self._indices)
+
+
+my_numbers = ArrayListHandler(int)
+my_numbers.extend(range(10))
+my_numbers.add(10)
+
+my_even_numbers = my_numbers[::2]  # a view, no copy
+my_some_numbers = my_numbers.get_many([1, 3, 5])
@@ -0,0 +1,233 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `lookup_name(mapping: Mapping[X, Y], ...)` (see `1_basic_use.py`)       #
+#  takes any `Mapping`, so a `Cache[K, V]` can be given to it directly:    #
+#                                                                          #
+#  `cache: Cache[str, bool] = Cache(maxsize=1024, ttl=60)`                 #
+#  `lookup_name(cache, "typing_rocks", True)`                              #
+#                                                                          #
+#  It evicts the least recently used entries (in O(1), the entries are     #
+#  kept in an `OrderedDict` in use order) once there are more than         #
+#  `maxsize` of them or they take more than `max_bytes`, and forgets the   #
+#  entries older than `ttl` seconds.                                       #
+#                                                                          #
+#  `get_or_compute(key, load)` calls `load` once per missing key, even if  #
+#  several threads miss the same key at the same time (single-flight).     #
+#  Writes take a lock, reads don't, so with many threads the hit and miss  #
+#  counters are approximate.                                               #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Iterator, Mapping, MutableMapping, NamedTuple, Optional, TypeVar, Union, overload
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+D = TypeVar("D")
+
+_MISSING: object = object()
+_FOREVER = float("inf")
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int  # entries dropped to stay under `maxsize` or `max_bytes`
+    expirations: int  # entries dropped because they were older than `ttl`
+    size: int
+    bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry(NamedTuple):
+    value: object
+    expires_at: float  # `_FOREVER` when there is no TTL
+    size: int
+
+
+class _Loading(Generic[V]):
+    # a key being loaded by `get_or_compute`, its lock is held until the value is ready
+    __slots__ = ("lock", "value", "error")
+    value: V
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.lock.acquire()
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> V:
+        with self.lock:
+            pass
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class Cache(MutableMapping[K, V]):
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = 1024,
+            ttl: Optional[float] = None,
+            max_bytes: Optional[int] = None,
+            sizeof: Callable[[V], int] = sys.getsizeof,
+    ) -> None:
+        # `sizeof` is only called when there is a `max_bytes` budget
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        self._entries: OrderedDict[K, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading: dict[K, _Loading[V]] = {}
+
+    def __getitem__(self, key: K) -> V:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value  # type: ignore[return-value]
+
+    @overload
+    def get(self, key: K) -> Optional[V]: ...
+
+    @overload
+    def get(self, key: K, default: Union[V, D]) -> Union[V, D]: ...
+
+    def get(self, key: K, default: object = None) -> object:
+        # the same as `Mapping.get` without raising and catching a `KeyError` on a miss
+        # a hit takes no lock, each `OrderedDict` call is atomic under the GIL
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at, _ = entry
+        if expires_at != _FOREVER and expires_at <= time.monotonic():
+            with self._lock:
+                if entries.get(key) is entry:
+                    self._remove(key)
+                    self.expirations += 1
+            self.misses += 1
+            return default
+        try:
+            entries.move_to_end(key)  # most recently used go last, evictions start from the front
+        except KeyError:
+            pass  # evicted by another thread in the meantime, we still have its value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self.set(key, value)
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        # `ttl` overrides the one of the cache for this entry
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise ValueError(f"a value of {size} bytes doesn't fit in a cache of {self.max_bytes} bytes")
+        expires_at = time.monotonic() + ttl if ttl is not None else _FOREVER
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        # doesn't count as a hit or a miss and doesn't change the use order
+        entry = self._entries.get(key)  # type: ignore[arg-type]
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def __iter__(self) -> Iterator[K]:
+        now = time.monotonic()
+        with self._lock:
+            return iter([key for key, entry in self._entries.items() if entry.expires_at > now])
+
+    def __len__(self) -> int:
+        return len(self._entries)  # expired entries are counted until something touches them
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_or_compute(self, key: K, load: Callable[[K], V]) -> V:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value  # type: ignore[return-value]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                # loaded by another thread since our miss, whose `_loading` may be gone already
+                self._entries.move_to_end(key)
+                return entry.value  # type: ignore[return-value]
+            loading = self._loading.get(key)
+            owner = loading is None
+            if loading is None:
+                loading = self._loading[key] = _Loading()
+        if not owner:
+            return loading.wait()  # another thread is loading it, wait for its result
+
+        try:
+            value = loading.value = load(key)
+            self.set(key, value)
+            return value
+        except BaseException as error:
+            loading.error = error  # the waiting threads get the error too, nothing is cached
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.lock.release()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, self.expirations, len(self._entries), self._bytes)
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.stats().hit_ratio
+
+    def _remove(self, key: K) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while (self.maxsize is not None and len(entries) > self.maxsize) or (
+                self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, entry = entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+
+# the same `lookup_name` of `1_basic_use.py`
+X = TypeVar('X')
+Y = TypeVar('Y')
+
+
+def lookup_name(mapping: Mapping[X, Y], key: X, default: Y) -> Y:
+    try:
+        return mapping[key]
+    except KeyError:
+        return default
+
+
+my_cache: Cache[str, bool] = Cache(maxsize=2, ttl=60.0)
+my_cache["typing_rocks"] = True
+my_cache["typing_is_hard"] = False
+
+my_truth = lookup_name(my_cache, "typing_rocks", True)  # a hit
+my_default = lookup_name(my_cache, "generics_are_easy", True)  # a miss, the default
+my_answer = my_cache.get_or_compute("generics_are_easy", lambda key: False)  # stored, "typing_is_hard" is evicted
@@ -0,0 +1,205 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `MyListHandler[T]` (see `2_own_generics.py`) and `ListOfNames[T]` (see  #
+#  `protocols/1_standard.py`) only ever touch their list one call at a     #
+#  time, which is safe by accident: iterating it while another thread      #
+#  appends can see some of the new items and not others.                   #
+#                                                                          #
+#  `ConcurrentListHandler` keeps `add` lock free (`list.append` is atomic  #
+#  with the GIL and locks only the list on free-threaded CPython) and      #
+#  hands out immutable snapshots to iterate over, so readers never block   #
+#  writers and never see a half-made update.                               #
+#                                                                          #
+#  `SharedListHandler` stores ints or floats in `multiprocessing`'s shared #
+#  memory: pickling it only sends the block name, so the workers of a      #
+#  `Pool` attach to the same memory and read it without copying.           #
+#                                                                          #
+#  `SharedListHandler(int, capacity=1_000_000)`                            #
+#  `pool.map(partial(total, handler), ranges)`  -> no list is pickled      #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import sys
+from array import array
+from multiprocessing import shared_memory
+from types import TracebackType
+from typing import Any, Generic, Iterable, Iterator, Optional, Type, TypeVar
+
+from generics.array_handler import TYPECODES
+from protocols.names_index import NamedProtocol
+
+T = TypeVar("T")
+N = TypeVar("N", bound=NamedProtocol)
+F = TypeVar("F", int, float)
+
+ITEM_TYPES = {typecode: item_type for item_type, typecode in TYPECODES.items()}
+
+_HEADER = 24  # length, capacity (int64 each) and the type code, the values start 8 byte aligned
+
+
+class ConcurrentListHandler(Generic[T]):
+    __slots__ = ("_items", "_snapshot")
+
+    def __init__(self, values: Iterable[T] = ()) -> None:
+        self._items: list[T] = list(values)
+        self._snapshot: tuple[T, ...] = ()
+
+    def add(self, val: T) -> None:
+        self._items.append(val)
+
+    def extend(self, values: Iterable[T]) -> None:
+        # built first, one `list.extend` call can't interleave with other threads
+        self._items.extend(list(values))
+
+    def get_at(self, index: int) -> T:
+        return self._items[index]
+
+    def snapshot(self) -> tuple[T, ...]:
+        # the items at one point in time, reused while nothing was added
+        snapshot = self._snapshot
+        if len(snapshot) != len(self._items):
+            snapshot = self._snapshot = tuple(self._items)  # the copy is made while holding the list
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.snapshot())
+
+
+class ConcurrentListOfNames(ConcurrentListHandler[N]):
+    __slots__ = ()
+
+    def get_names(self) -> list[str]:
+        return [item.full_name for item in self.snapshot()]
+
+
+class SharedListHandler(Generic[F]):
+    # an append only list of `int` or `float` in shared memory, with a single writer:
+    # the length is only raised after the value is written, readers never see a missing one
+    item_type: Type[F]
+    capacity: int
+    _memory: shared_memory.SharedMemory
+    _owner: bool
+    _header: "memoryview[int]"
+    _values: "memoryview[Any]"
+
+    def __init__(self, item_type: Type[F], capacity: int, *, name: Optional[str] = None) -> None:
+        if item_type not in TYPECODES:
+            raise TypeError(f"shared storage only supports {list(TYPECODES)}, not {item_type!r}")
+        self.item_type = item_type
+        self.capacity = capacity
+        self._memory = shared_memory.SharedMemory(name, create=True, size=_HEADER + 8 * capacity)
+        self._owner = True
+        self._buffer[16] = ord(TYPECODES[item_type])
+        self._map()
+        self._header[1] = capacity
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedListHandler[F]":
+        # opens a block made by another process, without taking ownership of it
+        handler: SharedListHandler[F] = cls.__new__(cls)
+        if sys.version_info >= (3, 13):
+            handler._memory = shared_memory.SharedMemory(name, track=False)
+        else:
+            # before 3.13 it's tracked as if we created it, harmless for the workers we start (they
+            # share our resource tracker) but an unrelated process would remove it when it ends
+            handler._memory = shared_memory.SharedMemory(name)
+        handler._owner = False
+        handler.item_type = ITEM_TYPES[chr(handler._buffer[16])]
+        handler._map()
+        handler.capacity = handler._header[1]
+        return handler
+
+    @property
+    def _buffer(self) -> memoryview:
+        buffer = self._memory.buf
+        assert buffer is not None, "the shared memory was closed"
+        return buffer
+
+    def _map(self) -> None:
+        buffer = self._buffer
+        self._header = buffer[:16].cast("q")
+        self._values = buffer[_HEADER:].cast(TYPECODES[self.item_type])  # type: ignore[call-overload]
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def add(self, val: F) -> None:
+        length = self._header[0]
+        if length == self.capacity:
+            raise OverflowError(f"the shared list is full ({self.capacity} items)")
+        self._values[length] = val
+        self._header[0] = length + 1
+
+    def extend(self, values: Iterable[F]) -> None:
+        batch = list(values)
+        length = self._header[0]
+        if length + len(batch) > self.capacity:
+            raise OverflowError(f"{len(batch)} more items don't fit in a shared list of {self.capacity}")
+        self._values[length:length + len(batch)] = array(self._values.format, batch)  # one copy, no loop
+        self._header[0] = length + len(batch)
+
+    def get_at(self, index: int) -> F:
+        length = self._header[0]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("shared list index out of range")
+        return self._values[index]  # type: ignore[no-any-return]
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> "memoryview[F]":
+        # a zero copy window over the values, release it (or let it go) before `close`
+        length = self._header[0]
+        return self._values[start:length if stop is None else min(stop, length)]
+
+    def __len__(self) -> int:
+        return self._header[0]
+
+    def __iter__(self) -> Iterator[F]:
+        return iter(self.view().tolist())
+
+    def __reduce__(self) -> tuple[object, tuple[str]]:
+        return SharedListHandler.attach, (self.name,)
+
+    def close(self) -> None:
+        # the owner also removes the block, the others only let it go
+        if self._memory.buf is None:
+            return
+        self._header.release()
+        self._values.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __del__(self) -> None:
+        # the views must go before the memory is unmapped, never unlink from here
+        if getattr(self, "_values", None) is not None and self._memory.buf is not None:
+            self._header.release()
+            self._values.release()
+            self._memory.close()
+
+    def __enter__(self) -> "SharedListHandler[F]":
+        return self
+
+    def __exit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+my_handler: ConcurrentListHandler[int] = ConcurrentListHandler()
+my_handler.add(1)
+my_handler.extend([2, 3])
+my_snapshot = my_handler.snapshot()  # (1, 2, 3), later adds don't change it
+
+if __name__ == '__main__':
+    with SharedListHandler(float, capacity=4) as shared:
+        shared.extend([1.5, 2.5])
+        other = SharedListHandler.attach(shared.name)  # i.e. from a worker process
+        print(other.get_at(1), len(other))  # 2.5 2
+        other.close()
@@ -0,0 +1,75 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `get_last_2`, `get_last_3` and `get_last_4` (see `1_basic_use.py`) take #
+#  a `list[T]`, so to get the last value of a generator we had to build    #
+#  the whole list first. These take any `Iterable[T]`:                     #
+#                                                                          #
+#  - a `Sequence` (list, tuple, str, range, ...) is just indexed, O(1)     #
+#  - anything else is consumed through a `deque` that keeps the last       #
+#    items only, O(k) memory whatever the length of the input              #
+#                                                                          #
+#  The type vars are the same as there: `P` is constrained to `str` or     #
+#  `bool` and `Q` is bound to `str`.                                       #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from collections import deque
+from itertools import islice
+from typing import Iterable, Sequence, TypeVar
+
+T = TypeVar("T")
+P = TypeVar("P", str, bool)
+Q = TypeVar("Q", bound=str)
+
+_MISSING = object()
+
+
+def _last(values: Iterable[T]) -> T:
+    if isinstance(values, Sequence):
+        return values[-1]  # type: ignore[no-any-return]  # IndexError when empty, as `my_list[-1]`
+    remaining = deque(values, maxlen=1)  # consumed in C, only the last item is kept
+    if not remaining:
+        raise IndexError("last item of an empty iterable")
+    return remaining[0]
+
+
+def get_last_2(values: Iterable[T]) -> T:
+    return _last(values)
+
+
+def get_last_3(values: Iterable[P]) -> P:
+    return _last(values)
+
+
+def get_last_4(values: Iterable[Q]) -> Q:
+    return _last(values)
+
+
+def last_n(values: Iterable[T], count: int) -> list[T]:
+    # the last `count` items in their original order, fewer if there aren't enough
+    if count <= 0:
+        return []
+    if isinstance(values, Sequence):
+        return list(values[-count:])
+    return list(deque(values, maxlen=count))
+
+
+def nth(values: Iterable[T], index: int) -> T:
+    # `values[index]` for anything iterable, negative indices count from the end
+    if isinstance(values, Sequence):
+        return values[index]  # type: ignore[no-any-return]
+    if index < 0:
+        remaining = deque(values, maxlen=-index)
+        if len(remaining) < -index:
+            raise IndexError(f"index {index} out of range")
+        return remaining[0]
+    item = next(islice(values, index, None), _MISSING)
+    if item is _MISSING:
+        raise IndexError(f"index {index} out of range")
+    return item  # type: ignore[return-value]
+
+
+my_last = get_last_2(str(number) for number in range(3))  # "2", no list is built
+my_last_3 = get_last_3(iter([True, False]))
+my_last_4 = get_last_4(("1", "2", "3"))  # a tuple is indexed directly
+my_last_two = last_n(range(10), 2)  # [8, 9]
+my_third = nth((number * number for number in range(10)), 3)  # 9
@@ -0,0 +1,143 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `Factory.construct_vehicle` (see `basics/3_dataclasses.py`) and the     #
+#  `CarFactory`/`MotorCycleFactory` of `protocols/2_custom.py` build a new #
+#  object on every call. An `ObjectPool[T]` keeps the released instances   #
+#  of one class in a bounded free list and hands them out again, running   #
+#  `__init__` once more so a recycled object looks like a new one.         #
+#                                                                          #
+#  Generics keep it type safe, the pool of `Car` only gives `Car` back:    #
+#                                                                          #
+#  `factory.construct_vehicle(Car, "medium")`   -> Car                     #
+#  `factory.release(my_car)`                                               #
+#                                                                          #
+#  Keep in mind CPython already recycles the memory of small objects, so   #
+#  a pool only pays off when building the object is expensive (big         #
+#  buffers, slow `__init__`), see `benchmarks/bench_object_pool.py`.       #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from dataclasses import dataclass
+from typing import Any, Generic, Mapping, Optional, Protocol, Type, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class PoolStats:
+    created: int = 0  # objects built from scratch
+    reused: int = 0  # objects taken from the free list
+    released: int = 0  # objects given back and kept
+    discarded: int = 0  # objects given back when the free list was full
+
+    def __add__(self, other: "PoolStats") -> "PoolStats":
+        return PoolStats(
+            self.created + other.created,
+            self.reused + other.reused,
+            self.released + other.released,
+            self.discarded + other.discarded,
+        )
+
+
+class ObjectPool(Generic[T]):
+    __slots__ = ("cls", "max_size", "stats", "_free", "_free_ids")
+
+    def __init__(self, cls: Type[T], max_size: int = 1024) -> None:
+        self.cls = cls
+        self.max_size = max_size
+        self.stats = PoolStats()
+        self._free: list[T] = []
+        self._free_ids: set[int] = set()  # guards against releasing the same object twice
+
+    def acquire(self, *args: Any, **kwargs: Any) -> T:
+        if self._free:
+            instance = self._free.pop()
+            self._free_ids.discard(id(instance))
+            instance.__init__(*args, **kwargs)  # type: ignore[misc]
+            self.stats.reused += 1
+            return instance
+        self.stats.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, instance: T) -> None:
+        if type(instance) is not self.cls:
+            raise TypeError(f"{type(instance).__name__} doesn't belong to the pool of {self.cls.__name__}")
+        if id(instance) in self._free_ids:
+            raise ValueError(f"{instance!r} was already released")
+        if len(self._free) >= self.max_size:
+            self.stats.discarded += 1
+            return
+        self._free.append(instance)
+        self._free_ids.add(id(instance))
+        self.stats.released += 1
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+class EngineVehicle(Protocol):
+    engine_type: str
+
+
+V = TypeVar("V", bound=EngineVehicle)
+
+
+class PooledFactory:
+    # one pool per vehicle class, `sizes` sets the free list bound of specific classes
+
+    def __init__(self, default_size: int = 1024, sizes: Optional[Mapping[type, int]] = None) -> None:
+        self.default_size = default_size
+        self.sizes = dict(sizes or {})
+        self._pools: dict[type, ObjectPool[Any]] = {}
+
+    def pool_for(self, my_class: Type[V]) -> ObjectPool[V]:
+        pool = self._pools.get(my_class)
+        if pool is None:
+            pool = self._pools[my_class] = ObjectPool(my_class, self.sizes.get(my_class, self.default_size))
+        return pool
+
+    def construct_vehicle(self, my_class: Type[V], engine_type: str) -> V:
+        return self.pool_for(my_class).acquire(engine_type=engine_type)
+
+    def release(self, vehicle: EngineVehicle) -> None:
+        pool = self._pools.get(type(vehicle))
+        if pool is None:
+            raise TypeError(f"{type(vehicle).__name__} wasn't built by this factory")
+        pool.release(vehicle)
+
+    @property
+    def stats(self) -> PoolStats:
+        return sum((pool.stats for pool in self._pools.values()), PoolStats())
+
+
+class PooledVehicleFactory(Generic[T]):
+    # the pooled version of `CarFactory`, it still follows the `Factory` protocol
+    # of `protocols/2_custom.py` since `construct_vehicle` takes no arguments
+
+    def __init__(self, cls: Type[T], max_size: int = 1024) -> None:
+        self.pool = ObjectPool(cls, max_size)
+
+    def construct_vehicle(self) -> T:
+        return self.pool.acquire()
+
+    def release(self, vehicle: T) -> None:
+        self.pool.release(vehicle)
+
+
+@dataclass
+class Vehicle:
+    engine_type: str
+
+
+class Car(Vehicle):
+    ...
+
+
+class MotorCycle(Vehicle):
+    ...
+
+
+factory = PooledFactory(sizes={MotorCycle: 16})
+
+my_car = factory.construct_vehicle(Car, "medium")  # Car, not just Vehicle
+factory.release(my_car)
+my_other_car = factory.construct_vehicle(Car, "small")  # the same object, built again
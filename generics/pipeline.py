@@ -0,0 +1,170 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `sum_tuple`, `get_last_2` or `lookup_name` take one value at a time.    #
+#  A `Pipeline[T]` chains the steps over a whole `Iterable[T]` and keeps   #
+#  the type of the items through every one of them:                        #
+#                                                                          #
+#  `Pipeline(names)`                   -> Pipeline[str]                    #
+#  `    .map(len)`                     -> Pipeline[int]                    #
+#  `    .filter(lambda size: size > 3)` -> Pipeline[int]                   #
+#  `    .batch(100)`                   -> Pipeline[list[int]]              #
+#  `    .reduce(lambda total, sizes: total + sum(sizes), 0)` -> int        #
+#                                                                          #
+#  Nothing runs until the pipeline is iterated (or reduced), every stage   #
+#  is a generator over the previous one, so items go through one by one.   #
+#  Each iteration starts again from the source: a pipeline over a list     #
+#  can be collected as often as needed, one over a generator only once.    #
+#                                                                          #
+#  `parallel(function, workers=4)` maps on a pool of threads (or of        #
+#  processes with `executor="process"`, or on an `Executor` you already    #
+#  have, which is left open), in the input order or, with                  #
+#  `ordered=False`, as soon as each item is done. At most `workers *       #
+#  prefetch` chunks of `chunksize` items are in flight, the input is read  #
+#  lazily as well.                                                         #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial, reduce
+from itertools import chain, islice
+from typing import Any, Callable, Generic, Iterable, Iterator, Literal, TypeVar, Union, overload
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+ExecutorKind = Literal["thread", "process"]
+
+_MISSING: object = object()
+
+
+def _map_chunk(function: Callable[[T], U], chunk: list[T]) -> list[U]:
+    return list(map(function, chunk))
+
+
+def _chunks(values: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class _Stage(Generic[T]):
+    # an iterable that runs the stage again every time it is iterated
+    __slots__ = ("_start",)
+
+    def __init__(self, start: Callable[[], Iterator[T]]) -> None:
+        self._start = start
+
+    def __iter__(self) -> Iterator[T]:
+        return self._start()
+
+
+def _parallel(
+        values: Iterable[T],
+        function: Callable[[T], U],
+        executor: Executor,
+        in_flight: int,
+        chunksize: int,
+        ordered: bool,
+        owned: bool,
+) -> Iterator[U]:
+    chunks = _chunks(values, chunksize)
+    task = partial(_map_chunk, function)  # a `partial` of a module function pickles, for processes
+    pending: deque[Future[list[U]]] = deque(executor.submit(task, chunk) for chunk in islice(chunks, in_flight))
+    running: set[Future[list[U]]] = set()
+    try:
+        if ordered:
+            while pending:
+                results = pending.popleft().result()
+                pending.extend(executor.submit(task, chunk) for chunk in islice(chunks, 1))
+                yield from results
+        else:
+            running = set(pending)
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                running.update(executor.submit(task, chunk) for chunk in islice(chunks, len(done)))
+                for future in done:
+                    yield from future.result()
+    finally:
+        # also when the consumer stops early, the chunks nobody will read are dropped
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in chain(pending, running):
+                future.cancel()
+
+
+class Pipeline(Generic[T]):
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Iterable[T]) -> None:
+        self._values = values
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._values)
+
+    def map(self, function: Callable[[T], U]) -> "Pipeline[U]":
+        values = self._values
+        return Pipeline(_Stage(lambda: map(function, values)))
+
+    def filter(self, predicate: Callable[[T], bool]) -> "Pipeline[T]":
+        values = self._values
+        return Pipeline(_Stage(lambda: filter(predicate, values)))
+
+    def batch(self, size: int) -> "Pipeline[list[T]]":
+        if size < 1:
+            raise ValueError("batches need at least one item")
+        values = self._values
+        return Pipeline(_Stage(lambda: _chunks(values, size)))
+
+    def flatten(self: "Pipeline[list[U]]") -> "Pipeline[U]":
+        # undoes `batch`
+        values = self._values
+        return Pipeline(_Stage(lambda: chain.from_iterable(values)))
+
+    def parallel(
+            self,
+            function: Callable[[T], U],
+            workers: int = 4,
+            executor: Union[ExecutorKind, Executor] = "thread",
+            ordered: bool = True,
+            chunksize: int = 1,
+            prefetch: int = 2,
+    ) -> "Pipeline[U]":
+        # for processes `function` must pickle (a module level function) and a bigger
+        # `chunksize` pays off, every chunk is one round trip to a worker
+        if workers < 1 or chunksize < 1 or prefetch < 1:
+            raise ValueError("workers, chunksize and prefetch must be at least 1")
+        values = self._values
+
+        def run() -> Iterator[U]:
+            # the pool starts when the pipeline is iterated, not when it is built
+            if isinstance(executor, Executor):
+                pool, owned = executor, False
+            else:
+                pool, owned = (ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor)(workers), True
+            yield from _parallel(values, function, pool, workers * prefetch, chunksize, ordered, owned)
+
+        return Pipeline(_Stage(run))
+
+    @overload
+    def reduce(self, function: Callable[[T, T], T]) -> T: ...
+
+    @overload
+    def reduce(self, function: Callable[[U, T], U], initial: U) -> U: ...
+
+    def reduce(self, function: Callable[[Any, Any], Any], initial: Any = _MISSING) -> Any:
+        if initial is _MISSING:
+            return reduce(function, self._values)
+        return reduce(function, self._values, initial)
+
+    def collect(self) -> list[T]:
+        return list(self._values)
+
+
+def word_size(word: str) -> int:
+    return len(word)
+
+
+my_names = ["Carlos", "Ana", "Xavier", "Charles", "Zoë"]
+my_sizes = Pipeline(my_names).map(word_size).filter(lambda size: size > 3).collect()  # [6, 6, 7]
+my_total = Pipeline(my_names).parallel(word_size, workers=2).batch(2).map(sum).reduce(lambda a, b: a + b)  # 25
@@ -0,0 +1,193 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Used as a rolling window of recent events, `MyListHandler` (see         #
+#  `2_own_generics.py`) grows without bound and trimming it with a slice   #
+#  copies the whole window on every event.                                 #
+#                                                                          #
+#  `RingBuffer[T]` preallocates `capacity` slots and wraps around, once    #
+#  full every `append` overwrites the oldest item, O(1) and no allocation: #
+#                                                                          #
+#  `events: RingBuffer[Test] = RingBuffer(1000)`          slots in a list  #
+#  `latencies = RingBuffer(1000, float)`                  array('d')       #
+#  `shared = RingBuffer(buffer=memoryview(shm.buf).cast("d"))`             #
+#                                                                          #
+#  `SPSCQueue[T]` is a bounded queue for exactly one producer thread and   #
+#  one consumer thread. Each side only moves its own counter, so neither   #
+#  takes a lock (the GIL makes a slot write and a counter write atomic).   #
+#                                                                          #
+#  Both are `Sized` and `Iterable` (see `protocols/1_standard.py`),        #
+#  iterating goes from the oldest item to the newest.                      #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import time
+from array import array
+from itertools import chain
+from queue import Empty, Full
+from typing import Any, Generic, Iterator, Optional, Type, TypeVar, Union
+
+from generics.array_handler import TYPECODES
+
+T = TypeVar("T")
+
+Buffer = Union["array[Any]", memoryview]
+
+_SPINS = 100  # blocking calls yield this many times before sleeping between checks
+_BACKOFF = 50e-6
+
+
+def _slots(capacity: int, item_type: Optional[type], buffer: Optional[Buffer]) -> tuple[Any, int]:
+    if buffer is not None:
+        capacity = len(buffer)  # used in place, e.g. a view on shared memory
+    if capacity < 1:
+        raise ValueError("the capacity must be at least 1")
+    if buffer is not None:
+        return buffer, capacity
+    typecode = TYPECODES.get(item_type) if item_type is not None else None
+    if typecode is None:
+        return [None] * capacity, capacity
+    return array(typecode, bytes(capacity * array(typecode).itemsize)), capacity
+
+
+class RingBuffer(Generic[T]):
+    __slots__ = ("capacity", "_items", "_end", "_size", "_release")
+
+    def __init__(self, capacity: int = 0, item_type: Optional[Type[T]] = None, buffer: Optional[Buffer] = None) -> None:
+        self._items, self.capacity = _slots(capacity, item_type, buffer)
+        self._release = isinstance(self._items, list)  # drop references to popped objects
+        self._end = 0  # the slot the next item goes to, the oldest is `_size` slots before it
+        self._size = 0
+
+    def append(self, value: T) -> None:
+        # once full the slot of `_end` holds the oldest item, it is overwritten
+        end = self._end
+        self._items[end] = value
+        end += 1
+        self._end = 0 if end == self.capacity else end
+        if self._size != self.capacity:
+            self._size += 1
+
+    def popleft(self) -> T:
+        # the oldest item
+        if not self._size:
+            raise IndexError("pop from an empty ring buffer")
+        slot = self._end - self._size  # negative indices wrap around for us
+        value: T = self._items[slot]
+        if self._release:
+            self._items[slot] = None
+        self._size -= 1
+        return value
+
+    def pop(self) -> T:
+        # the newest item
+        if not self._size:
+            raise IndexError("pop from an empty ring buffer")
+        end = (self._end or self.capacity) - 1
+        value: T = self._items[end]
+        if self._release:
+            self._items[end] = None
+        self._end = end
+        self._size -= 1
+        return value
+
+    def __getitem__(self, index: int) -> T:
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ring buffer index out of range")
+        return self._items[self._end - size + index]  # type: ignore[no-any-return]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        # at most two slices, one up to the end of the slots and one from their start
+        items, start, stop = self._items, self._end - self._size, self._end
+        if start >= 0:
+            return iter(items[start:stop])
+        return chain(items[start:], items[:stop])
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def clear(self) -> None:
+        if self._release:
+            self._items[:] = [None] * self.capacity
+        self._end = self._size = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r}, capacity={self.capacity})"
+
+
+class SPSCQueue(Generic[T]):
+    # `_tail` only moves in the producer, `_head` only in the consumer, both just
+    # grow, the slot of a counter is the counter modulo the capacity
+    __slots__ = ("capacity", "_items", "_head", "_tail", "_release")
+
+    def __init__(self, capacity: int = 0, item_type: Optional[Type[T]] = None, buffer: Optional[Buffer] = None) -> None:
+        self._items, self.capacity = _slots(capacity, item_type, buffer)
+        self._release = isinstance(self._items, list)  # drop references to consumed objects
+        self._head = 0
+        self._tail = 0
+
+    def put_nowait(self, value: T) -> None:
+        tail = self._tail
+        if tail - self._head >= self.capacity:
+            raise Full
+        self._items[tail % self.capacity] = value
+        self._tail = tail + 1  # published after the slot is written
+
+    def get_nowait(self) -> T:
+        head = self._head
+        if head == self._tail:
+            raise Empty
+        slot = head % self.capacity
+        value: T = self._items[slot]
+        if self._release:
+            self._items[slot] = None
+        self._head = head + 1  # the producer may reuse the slot from now on
+        return value
+
+    def put(self, value: T, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        spins = 0
+        while self._tail - self._head >= self.capacity:
+            spins = _wait(spins, deadline, Full)
+        self.put_nowait(value)
+
+    def get(self, timeout: Optional[float] = None) -> T:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        spins = 0
+        while self._head == self._tail:
+            spins = _wait(spins, deadline, Empty)
+        return self.get_nowait()
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __iter__(self) -> Iterator[T]:
+        # what is queued right now, without taking it
+        items, capacity = self._items, self.capacity
+        return (items[index % capacity] for index in range(self._head, self._tail))
+
+
+def _wait(spins: int, deadline: Optional[float], timeout_error: type[Exception]) -> int:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise timeout_error
+    time.sleep(0 if spins < _SPINS else _BACKOFF)  # `sleep(0)` lets the other thread run
+    return spins + 1
+
+
+my_window: RingBuffer[str] = RingBuffer(3)
+for my_event in ("login", "click", "scroll", "logout"):
+    my_window.append(my_event)
+my_recent = list(my_window)  # ['click', 'scroll', 'logout']
+
+my_latencies = RingBuffer(1000, float)  # backed by array('d'), 8 bytes per slot
+my_latencies.append(0.25)
+
+my_queue: SPSCQueue[int] = SPSCQueue(2)
+my_queue.put_nowait(1)
+my_queue.put_nowait(2)
+my_first = my_queue.get_nowait()  # 1
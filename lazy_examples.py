@@ -0,0 +1,193 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  The examples can't be imported with an `import` statement, their names  #
+#  start with a digit, and executing them runs the lines that fail on      #
+#  purpose too (`my_test_2.not_a_method()`).                               #
+#                                                                          #
+#  Every package installs an import hook for its examples, named without   #
+#  the number:                                                             #
+#                                                                          #
+#  `import basics.variables`           -> `basics/1_variables.py`          #
+#  `from generics.own_generics import MyListHandler`                       #
+#  `protocols.standard.ListOfNames`    -> no import needed, the package    #
+#                                         `__getattr__` imports it         #
+#                                                                          #
+#  Importing an example doesn't run it, that happens the first time one of #
+#  its attributes is touched. Then every top level statement runs on its   #
+#  own and the ones that raise are skipped (and listed in `__skipped__`).  #
+#  The statements are compiled once and kept in `__pycache__` as a         #
+#  `.examples.pyc` file, later imports don't parse the source again.       #
+#                                                                          #
+#  This module is imported by every package, so it stays away from the     #
+#  modules that are slow to import (`ast` is only needed on a cache miss,  #
+#  `importlib.abc` pulls in `importlib.resources`, `pathlib` and `re` add  #
+#  ~15 ms).                                                                #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import importlib
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import struct
+import sys
+from types import CodeType, ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, cast
+
+if TYPE_CHECKING:
+    from importlib.abc import Loader
+
+
+_CACHE_HEADER = struct.Struct("<4sqq")  # interpreter magic number, source mtime in ns, source size
+_CACHE_SUFFIX = ".examples.pyc"
+
+
+def example_alias(file_name: str) -> Optional[str]:
+    # `1_variables.py` -> `variables`, `1_2_typed_dict.py` -> `typed_dict`
+    stem, extension = os.path.splitext(file_name)
+    parts = stem.split("_")
+    numbers = 0
+    while numbers < len(parts) and parts[numbers].isdigit():
+        numbers += 1
+    alias = "_".join(parts[numbers:])
+    if extension != ".py" or not numbers or not alias.isidentifier():
+        return None
+    return alias
+
+
+def examples_in(directory: "os.PathLike[str] | str") -> dict[str, str]:
+    # the aliases of the numbered examples of a package, a real module with the same name wins
+    names = sorted(os.listdir(directory))
+    aliases: dict[str, str] = {}
+    for name in names:
+        alias = example_alias(name)
+        if alias and f"{alias}.py" not in names:
+            aliases[alias] = os.path.join(directory, name)
+    return aliases
+
+
+def _cache_path(path: str) -> str:
+    return importlib.util.cache_from_source(path)[:-len(".pyc")] + _CACHE_SUFFIX
+
+
+Statement = tuple[int, CodeType]  # first line, code
+
+
+def _read_cache(cache: str, source: os.stat_result) -> Optional[list[Statement]]:
+    try:
+        with open(cache, "rb") as file:
+            data = file.read()
+        magic, mtime_ns, size = _CACHE_HEADER.unpack_from(data)
+        if (magic, mtime_ns, size) != (importlib.util.MAGIC_NUMBER, source.st_mtime_ns, source.st_size):
+            return None
+        return list(marshal.loads(data[_CACHE_HEADER.size:]))
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None  # missing, stale or corrupt, it is compiled again
+
+
+def _write_cache(cache: str, source: os.stat_result, statements: Sequence[Statement]) -> None:
+    if sys.dont_write_bytecode:
+        return
+    header = _CACHE_HEADER.pack(importlib.util.MAGIC_NUMBER, source.st_mtime_ns, source.st_size)
+    temporary = f"{cache}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(temporary, "wb") as file:
+            file.write(header + marshal.dumps(tuple(statements)))
+        os.replace(temporary, cache)  # readers never see half a file
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)  # a read only checkout just doesn't cache
+
+
+def compiled_statements(path: str) -> list[Statement]:
+    # one code object per top level statement, so that one failing doesn't stop the rest
+    source = os.stat(path)
+    cache = _cache_path(path)
+    statements = _read_cache(cache, source)
+    if statements is None:
+        import ast
+
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+        statements = [
+            (statement.lineno, compile(ast.Module(body=[statement], type_ignores=[]), path, "exec"))
+            for statement in tree.body
+        ]
+        _write_cache(cache, source, statements)
+    return statements
+
+
+class ExampleLoader:
+    # the `importlib.abc.Loader` protocol, without importing `importlib.abc`
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> None:
+        return None  # the default module
+
+    def exec_module(self, module: ModuleType) -> None:
+        namespace = module.__dict__
+        skipped: list[tuple[int, str]] = []
+        for line, statement in compiled_statements(self.path):
+            try:
+                exec(statement, namespace)
+            except Exception as error:
+                skipped.append((line, repr(error)))
+        namespace["__skipped__"] = skipped
+
+
+class ExampleFinder:
+    # the `importlib.abc.MetaPathFinder` protocol
+
+    def __init__(self) -> None:
+        self.packages: dict[str, dict[str, str]] = {}
+
+    def find_spec(
+            self,
+            fullname: str,
+            path: Optional[Sequence[str]] = None,
+            target: Optional[ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        package, _, alias = fullname.rpartition(".")
+        example = self.packages.get(package, {}).get(alias)
+        if example is None:
+            return None
+        loader = cast("Loader", ExampleLoader(example))
+        spec = importlib.util.spec_from_file_location(fullname, example, loader=loader)
+        if spec is None:
+            return None
+        spec.loader = importlib.util.LazyLoader(loader)  # executed on first attribute access
+        return spec
+
+
+FINDER = ExampleFinder()
+
+
+def install(package: str, package_path: Sequence[str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    # the `__getattr__` and `__dir__` of a package, called from its `__init__.py`
+    aliases = examples_in(package_path[0])
+    FINDER.packages[package] = aliases
+    if FINDER not in sys.meta_path:
+        sys.meta_path.insert(0, FINDER)
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name in aliases:
+            return importlib.import_module(f"{package}.{name}")  # binds it on the package too
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *aliases})
+
+    return __getattr__, __dir__
+
+
+def alias_of(relative_path: str) -> str:
+    # `basics/1_variables.py` -> `basics.variables`
+    package, _, file_name = relative_path.rpartition("/")
+    alias = example_alias(file_name)
+    if alias is None:
+        raise ValueError(f"{relative_path} isn't a numbered example")
+    return f"{package.replace('/', '.')}.{alias}"
@@ -1,16 +1,229 @@
-# This is a sample Python script.
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Runner for type checking every example of the repository at once.       #
+#                                                                          #
+#  Every example module under `basics/`, `generics/` and `protocols/` is   #
+#  checked in parallel against one persistent mypy cache, and only files   #
+#  whose content, or the content of a local module they import, changed    #
+#  since the last run are re-checked:                                      #
+#                                                                          #
+#  `python main.py`            incremental, parallel run                   #
+#  `python main.py --force`    re-check everything (cache is still used)   #
+#  `python main.py --cold`     sequential run with an empty cache          #
+#  `python main.py --daemon`   check changed files through `dmypy`         #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
 
-# Press Mayús+F10 to execute it or replace it with your code.
-# Press Double Shift to search everywhere for classes, files, tool windows, actions, and settings.
+ROOT = Path(__file__).resolve().parent
+EXAMPLE_PACKAGES = ("basics", "generics", "protocols")
+CACHE_DIR = ROOT / ".mypy_cache"
+HASHES_FILE = CACHE_DIR / "example_hashes.json"
 
 
-def print_hi(name):
-    # Use a breakpoint in the code line below to debug your script.
-    print(f'Hi, {name}')  # Press Ctrl+F8 to toggle the breakpoint.
+@dataclass
+class CheckResult:
+    path: str
+    digest: str
+    status: int
+    output: str
+    seconds: float
+    cached: bool = False
 
 
-# Press the green button in the gutter to run the script.
-if __name__ == '__main__':
-    print_hi('PyCharm')
+def discover_examples(root: Path = ROOT, packages: Iterable[str] = EXAMPLE_PACKAGES) -> list[Path]:
+    examples: list[Path] = []
+    for package in packages:
+        examples.extend(
+            path for path in sorted((root / package).glob("*.py"))
+            if path.name != "__init__.py"
+        )
+    return examples
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def local_imports(path: Path, root: Path = ROOT) -> tuple[Path, ...]:
+    # the modules of this repository `path` imports, mypy checks them together with it
+    try:
+        tree = ast.parse(path.read_bytes())
+    except SyntaxError:
+        return ()  # mypy reports it
+    names: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from package import module` imports a module too
+            names.append(node.module)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    modules: list[Path] = []
+    for name in names:
+        parts = name.split(".")
+        for length in range(1, len(parts) + 1):  # importing `a.b` runs `a/__init__.py` first
+            base = root.joinpath(*parts[:length])
+            modules.extend(candidate for candidate in (base.with_suffix(".py"), base / "__init__.py") if candidate.is_file())
+    return tuple(dict.fromkeys(modules))
+
+
+def example_digest(path: Path) -> str:
+    # the file and every local module it imports, directly or not, so editing
+    # `generics/array_handler.py` also re-checks `generics/ring_buffer.py`
+    files, pending = {path}, [path]
+    while pending:
+        for module in local_imports(pending.pop()):
+            if module not in files:
+                files.add(module)
+                pending.append(module)
+    digest = hashlib.sha256()
+    for file in sorted(files):
+        digest.update(f"{file.relative_to(ROOT)} {file_digest(file)}\n".encode())
+    return digest.hexdigest()
+
+
+def load_previous_results(hashes_file: Path = HASHES_FILE) -> dict[str, CheckResult]:
+    try:
+        raw = json.loads(hashes_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {path: CheckResult(**values) for path, values in raw.items()}
+
+
+def save_results(results: Iterable[CheckResult], hashes_file: Path = HASHES_FILE) -> None:
+    hashes_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = {result.path: dict(asdict(result), cached=False) for result in results}
+    hashes_file.write_text(json.dumps(payload, indent=2))
+
+
+def check_file(path: Path, cache_dir: Path) -> CheckResult:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-m", "mypy", "--cache-dir", str(cache_dir), str(path.relative_to(ROOT))],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return CheckResult(
+        path=str(path.relative_to(ROOT)),
+        digest=example_digest(path),
+        status=process.returncode,
+        output=process.stdout + process.stderr,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def check_with_daemon(paths: Sequence[Path]) -> list[CheckResult]:
+    # dmypy keeps the whole build in memory, so a single call for every changed
+    # file is cheaper than one call per file. Timings are shared between them.
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-m", "mypy.dmypy", "run", "--", *(str(path.relative_to(ROOT)) for path in paths)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    seconds = (time.perf_counter() - start) / max(len(paths), 1)
+    results: list[CheckResult] = []
+    for path in paths:
+        relative = str(path.relative_to(ROOT))
+        lines = [line for line in process.stdout.splitlines() if line.startswith(relative + ":")]
+        results.append(CheckResult(
+            path=relative,
+            digest=example_digest(path),
+            status=1 if any(": error:" in line for line in lines) else 0,
+            output="\n".join(lines),
+            seconds=seconds,
+        ))
+    return results
 
-# See PyCharm help at https://www.jetbrains.com/help/pycharm/
+
+def run_checks(
+        paths: Sequence[Path],
+        jobs: int,
+        force: bool = False,
+        cold: bool = False,
+        daemon: bool = False,
+) -> list[CheckResult]:
+    if cold:
+        # the baseline we compare against: one file after the other, no cache at all
+        with tempfile.TemporaryDirectory() as empty_cache:
+            return [check_file(path, Path(empty_cache) / path.stem) for path in paths]
+
+    previous = {} if force else load_previous_results()
+    results: dict[str, CheckResult] = {}
+    pending: list[Path] = []
+    for path in paths:
+        relative = str(path.relative_to(ROOT))
+        old: Optional[CheckResult] = previous.get(relative)
+        if old is not None and old.digest == example_digest(path):
+            old.cached = True
+            old.seconds = 0.0
+            results[relative] = old
+        else:
+            pending.append(path)
+
+    if pending and daemon:
+        checked = check_with_daemon(pending)
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            checked = list(executor.map(lambda path: check_file(path, CACHE_DIR), pending))
+
+    for result in checked:
+        results[result.path] = result
+
+    ordered = [results[str(path.relative_to(ROOT))] for path in paths]
+    save_results(ordered)
+    return ordered
+
+
+def print_report(results: Sequence[CheckResult], wall_clock: float, verbose: bool) -> None:
+    for result in results:
+        state = "cached" if result.cached else f"{result.seconds:6.2f}s"
+        verdict = "ok" if result.status == 0 else "errors"
+        print(f"{state:>8}  {verdict:<6}  {result.path}")
+        if verbose and result.output.strip():
+            print(result.output.rstrip())
+
+    checked = [result for result in results if not result.cached]
+    cpu_time = sum(result.seconds for result in checked)
+    print(
+        f"\n{len(checked)} checked, {len(results) - len(checked)} unchanged, "
+        f"sum of per-file times {cpu_time:.2f}s, wall clock {wall_clock:.2f}s"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Type check every example module with mypy.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--force", action="store_true", help="ignore content hashes and re-check everything")
+    parser.add_argument("--cold", action="store_true", help="sequential run with an empty cache (baseline)")
+    parser.add_argument("--daemon", action="store_true", help="use a local dmypy daemon for changed files")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print mypy output for every file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_checks(discover_examples(), args.jobs, force=args.force, cold=args.cold, daemon=args.daemon)
+    print_report(results, time.perf_counter() - start, args.verbose)
+
+    # status 2 means mypy itself crashed or was misused, errors on the examples are status 1
+    return max((result.status for result in results), default=0)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+from lazy_examples import install
+
+__getattr__, __dir__ = install(__name__, __path__)
+del install
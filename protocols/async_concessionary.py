@@ -0,0 +1,245 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `Concessionary.client_buys()` (see `2_custom.py`) sells one vehicle at  #
+#  a time and picks its factory with an if/elif chain on the vehicle type. #
+#                                                                          #
+#  `AsyncConcessionary` takes a stream of purchase orders and builds the   #
+#  vehicles concurrently with a fixed number of workers. Orders wait in a  #
+#  bounded queue, so a fast producer is slowed down (back-pressure)        #
+#  instead of piling up orders in memory. Factories are looked up in a     #
+#  registry, adding a vehicle type is one `register_factory` call and the  #
+#  lookup stays a single dict access.                                      #
+#                                                                          #
+#  `async for sale in concessionary.serve(orders): ...`                    #
+#  `concessionary.latency.summary()`  -> {"p50": ..., "p99": ...}          #
+#                                                                          #
+#  An order that can't be built stops the stream with its error. With      #
+#  `serve(orders, return_failures=True)` it comes out as a `FailedOrder`   #
+#  instead and the other orders keep going.                                #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import asyncio
+from typing import (
+    AsyncIterable, AsyncIterator, Callable, Iterable, Literal, NamedTuple, Optional, Protocol, TypeVar, Union,
+    overload,
+)
+
+
+class Vehicle(Protocol):
+    name: str
+
+    def turn_on(self) -> None: ...
+
+    def turn_off(self) -> None: ...
+
+
+class AsyncFactory(Protocol):
+
+    async def construct_vehicle(self) -> Vehicle: ...
+
+
+F = TypeVar("F", bound=Callable[[], AsyncFactory])
+
+FACTORY_REGISTRY: dict[str, Callable[[], AsyncFactory]] = {}
+
+
+def register_factory(vehicle_type: str) -> Callable[[F], F]:
+    def decorator(factory: F) -> F:
+        FACTORY_REGISTRY[vehicle_type] = factory
+        return factory
+
+    return decorator
+
+
+class UnknownVehicleType(LookupError):
+    ...
+
+
+class PurchaseOrder(NamedTuple):
+    client: str
+    vehicle_type: str
+
+
+class Sale(NamedTuple):
+    order: PurchaseOrder
+    vehicle: Vehicle
+    latency: float  # seconds from the order being queued to the vehicle being ready
+
+
+class FailedOrder(NamedTuple):
+    order: PurchaseOrder
+    error: Exception
+
+
+class LatencyStats:
+
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        if not self.samples:
+            raise ValueError("no latency recorded yet")
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def summary(self) -> dict[str, float]:
+        return {f"p{percent}": self.percentile(percent) for percent in (50, 90, 99)} | {"max": max(self.samples)}
+
+
+Orders = Union[Iterable[PurchaseOrder], AsyncIterable[PurchaseOrder]]
+
+
+class AsyncConcessionary:
+
+    def __init__(
+            self,
+            workers: int = 8,
+            queue_size: int = 64,
+            registry: Optional[dict[str, Callable[[], AsyncFactory]]] = None,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.registry = FACTORY_REGISTRY if registry is None else registry
+        self.latency = LatencyStats()
+        self._factories: dict[str, AsyncFactory] = {}
+
+    def factory_for(self, vehicle_type: str) -> AsyncFactory:
+        factory = self._factories.get(vehicle_type)
+        if factory is None:
+            try:
+                factory = self._factories[vehicle_type] = self.registry[vehicle_type]()
+            except KeyError:
+                raise UnknownVehicleType(vehicle_type) from None
+        return factory
+
+    async def client_buys(self, vehicle_type: str) -> Vehicle:
+        return await self.factory_for(vehicle_type).construct_vehicle()
+
+    @overload
+    def serve(self, orders: Orders, return_failures: Literal[False] = False) -> AsyncIterator[Sale]: ...
+
+    @overload
+    def serve(self, orders: Orders, return_failures: Literal[True]) -> AsyncIterator[Union[Sale, FailedOrder]]: ...
+
+    async def serve(self, orders: Orders, return_failures: bool = False) -> AsyncIterator[Union[Sale, FailedOrder]]:
+        loop = asyncio.get_running_loop()
+        # `None` tells a worker there are no more orders, and tells us a worker has finished
+        inbox: asyncio.Queue[Optional[tuple[PurchaseOrder, float]]] = asyncio.Queue(maxsize=self.queue_size)
+        outbox: asyncio.Queue[Union[Sale, FailedOrder, Exception, None]] = asyncio.Queue(maxsize=self.queue_size)
+
+        async def produce() -> None:
+            try:
+                if isinstance(orders, AsyncIterable):
+                    async for order in orders:
+                        await inbox.put((order, loop.time()))  # waits while the queue is full
+                else:
+                    for order in orders:
+                        await inbox.put((order, loop.time()))
+            except Exception as error:
+                await outbox.put(error)  # the orders themselves failed, that ends the stream
+                return
+            # not in a `finally`, once cancelled a put on a full inbox would never return
+            for _ in range(self.workers):
+                await inbox.put(None)
+
+        async def work() -> None:
+            while (item := await inbox.get()) is not None:
+                order, queued_at = item
+                try:
+                    vehicle = await self.client_buys(order.vehicle_type)
+                except Exception as error:
+                    await outbox.put(FailedOrder(order, error))
+                    continue
+                latency = loop.time() - queued_at
+                self.latency.record(latency)
+                await outbox.put(Sale(order, vehicle, latency))
+            await outbox.put(None)
+
+        tasks = [asyncio.create_task(produce()), *(asyncio.create_task(work()) for _ in range(self.workers))]
+        try:
+            finished = 0
+            while finished < self.workers:
+                item = await outbox.get()
+                if item is None:
+                    finished += 1
+                elif isinstance(item, Exception):
+                    raise item
+                elif isinstance(item, FailedOrder) and not return_failures:
+                    raise item.error
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Car:
+    name: str = "car"
+
+    def turn_on(self) -> None:
+        print("turning the car on")
+
+    def turn_off(self) -> None:
+        print("turning the car off")
+
+
+class MotorCycle:
+    name: str = "motor cycle"
+
+    def turn_on(self) -> None:
+        print("turning the motorcycle on")
+
+    def turn_off(self) -> None:
+        print("turning the motorcycle off")
+
+
+@register_factory("car")
+class AsyncCarFactory:
+
+    def __init__(self, build_time: float = 0.001) -> None:
+        self.build_time = build_time
+
+    async def construct_vehicle(self) -> Car:
+        await asyncio.sleep(self.build_time)  # i.e. waiting for the assembly line
+        return Car()
+
+
+@register_factory("motorcycle")
+class AsyncMotorCycleFactory:
+
+    def __init__(self, build_time: float = 0.001) -> None:
+        self.build_time = build_time
+
+    async def construct_vehicle(self) -> MotorCycle:
+        await asyncio.sleep(self.build_time)
+        return MotorCycle()
+
+
+async def _sell_some_vehicles() -> list[Union[Sale, FailedOrder]]:
+    concessionary = AsyncConcessionary(workers=4, queue_size=8)
+    orders = [PurchaseOrder(f"client {number}", "car" if number % 2 else "motorcycle") for number in range(20)]
+    orders.insert(5, PurchaseOrder("client 20", "boat"))  # no factory for it, the rest is still sold
+    return [result async for result in concessionary.serve(orders, return_failures=True)]
+
+
+async def _stop_at_the_failed_order() -> str:
+    # the error comes out of `serve` (it used to hang here with a full inbox)
+    concessionary = AsyncConcessionary(workers=2, queue_size=2)
+    orders = [PurchaseOrder("client 0", "boat"), *(PurchaseOrder(f"client {number}", "car") for number in range(1, 20))]
+    try:
+        async for _ in concessionary.serve(orders):
+            pass
+    except UnknownVehicleType as error:
+        return f"stopped at the order for a {error}"
+    return "sold everything"
+
+
+if __name__ == '__main__':
+    results = asyncio.run(_sell_some_vehicles())
+    failed = [result for result in results if isinstance(result, FailedOrder)]
+    print(f"sold {len(results) - len(failed)} vehicles, failed {[result.order.client for result in failed]}")
+    print(asyncio.run(asyncio.wait_for(_stop_at_the_failed_order(), timeout=5)))
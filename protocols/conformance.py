@@ -0,0 +1,222 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `isinstance(obj, Barker)` works once `Barker` is `@runtime_checkable`,  #
+#  but every call walks the protocol members again, and it only checks     #
+#  that they exist: `InvalidNamedClass` (see `1_standard.py`) passes       #
+#  `isinstance(obj, NamedProtocol)` even though its `full_name` is `int`.  #
+#                                                                          #
+#  `checker_for(NamedProtocol)` compares the members *and* their annotated #
+#  types once per concrete class and caches the verdict. A cached verdict  #
+#  is only trusted while the class members it looked at are the same       #
+#  objects, so patching `Dog.bark = ...` invalidates it.                   #
+#                                                                          #
+#  `ProtocolDispatch` builds on it to pick a handler per protocol, the     #
+#  same way `functools.singledispatch` does per class.                     #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from functools import lru_cache
+from typing import (
+    Any, Callable, Generic, NamedTuple, Optional, Protocol, Type, TypeGuard, TypeVar, Union, cast, get_args,
+    get_origin, get_type_hints, runtime_checkable,
+)
+
+P = TypeVar("P")
+R = TypeVar("R")
+
+_MISSING = object()
+_NOT_MEMBERS = {"__init__", "__subclasshook__", "__class_getitem__", "__init_subclass__"}
+
+
+class _Member(NamedTuple):
+    name: str
+    expected: Any  # annotated type, or the return type for methods and properties
+    is_method: bool
+
+
+class _Verdict(NamedTuple):
+    conforms: bool
+    fingerprint: tuple[object, ...]
+    instance_members: tuple[str, ...]  # only found on the instances, checked on every call
+
+
+def _hints(obj: Any) -> dict[str, Any]:
+    try:
+        return get_type_hints(obj)
+    except Exception:  # forward references we can't resolve, treat them as unknown
+        return {}
+
+
+def _protocol_members(protocol: type) -> list[_Member]:
+    protocol = get_origin(protocol) or protocol  # `typing.Sized` is an alias of `collections.abc.Sized`
+    if not getattr(protocol, "_is_protocol", False):
+        # abstract base classes such as `Sized` or `Iterable` only tell us the method names
+        return [_Member(name, Any, True) for name in sorted(getattr(protocol, "__abstractmethods__", ()))]
+
+    members: dict[str, _Member] = {}
+    hints = _hints(protocol)
+    for base in reversed(protocol.__mro__):
+        if not getattr(base, "_is_protocol", False) or base is Protocol or base is Generic:
+            continue
+        for name in getattr(base, "__annotations__", {}):
+            members[name] = _Member(name, hints.get(name, Any), False)
+        for name, value in vars(base).items():
+            if name in _NOT_MEMBERS:
+                continue
+            if isinstance(value, property):
+                members[name] = _Member(name, _hints(value.fget).get("return", Any), False)
+            elif callable(value) or isinstance(value, (classmethod, staticmethod)):
+                members[name] = _Member(name, _hints(value).get("return", Any), True)
+    return list(members.values())
+
+
+def is_compatible(actual: Any, expected: Any) -> bool:
+    if expected is Any or actual is Any or actual == expected:
+        return True
+    if get_origin(actual) is Union:
+        return all(is_compatible(member, expected) for member in get_args(actual))
+    if get_origin(expected) is Union:
+        return any(is_compatible(actual, member) for member in get_args(expected))
+    if isinstance(actual, type) and isinstance(expected, type):
+        # the numeric promotion type checkers apply, an int is a valid float
+        return issubclass(actual, expected) or (expected is float and issubclass(actual, int))
+    actual_origin, expected_origin = get_origin(actual), get_origin(expected)
+    if actual_origin is not None and expected_origin is not None:
+        return is_compatible(actual_origin, expected_origin) and all(
+            is_compatible(actual_arg, expected_arg)
+            for actual_arg, expected_arg in zip(get_args(actual), get_args(expected))
+        )
+    return False
+
+
+class ProtocolChecker(Generic[P]):
+    __slots__ = ("protocol", "members", "_names", "_verdicts")
+
+    def __init__(self, protocol: Type[P]) -> None:
+        self.protocol = protocol
+        self.members = _protocol_members(protocol)
+        self._names = tuple(member.name for member in self.members)
+        self._verdicts: dict[type, _Verdict] = {}
+
+    def __call__(self, obj: object) -> TypeGuard[P]:
+        cls = type(obj)
+        verdict = self._verdicts.get(cls)
+        if verdict is None or verdict[1] != self._fingerprint(cls):
+            verdict = self._verdicts[cls] = self._check_class(cls)
+        conforms, _, instance_members = verdict
+        if instance_members:
+            return conforms and all(hasattr(obj, name) for name in instance_members)
+        return conforms
+
+    def problems(self, cls: type) -> list[str]:
+        # why `cls` doesn't conform, mostly useful for error messages
+        return [problem for member in self.members for problem in self._member_problems(cls, _hints(cls), member)]
+
+    def invalidate(self, cls: Optional[type] = None) -> None:
+        if cls is None:
+            self._verdicts.clear()
+        else:
+            self._verdicts.pop(cls, None)
+
+    def _fingerprint(self, cls: type) -> tuple[object, ...]:
+        return tuple([getattr(cls, name, _MISSING) for name in self._names])
+
+    def _check_class(self, cls: type) -> _Verdict:
+        hints = _hints(cls)
+        conforms = True
+        instance_members: list[str] = []
+        for member in self.members:
+            if getattr(cls, member.name, _MISSING) is _MISSING and member.name not in hints and not member.is_method:
+                # i.e. attributes that `__init__` sets without annotating them in the class
+                instance_members.append(member.name)
+            elif self._member_problems(cls, hints, member):
+                conforms = False
+        return _Verdict(conforms, self._fingerprint(cls), tuple(instance_members))
+
+    def _member_problems(self, cls: type, hints: dict[str, Any], member: _Member) -> list[str]:
+        value = getattr(cls, member.name, _MISSING)
+        if member.is_method:
+            if value is _MISSING or not callable(value):
+                return [f"{cls.__name__}.{member.name} is not a method"]
+            actual = _hints(value).get("return", Any)
+        elif isinstance(value, property):
+            actual = _hints(value.fget).get("return", Any)
+        elif member.name in hints:
+            actual = hints[member.name]
+        elif value is not _MISSING:
+            actual = type(value)
+        else:
+            return []  # can only be told apart on the instances
+
+        if not is_compatible(actual, member.expected):
+            return [f"{cls.__name__}.{member.name} is {actual!r}, expected {member.expected!r}"]
+        return []
+
+
+def checker_for(protocol: Type[P]) -> ProtocolChecker[P]:
+    return cast(ProtocolChecker[P], _cached_checker(cast(type, protocol)))
+
+
+@lru_cache(maxsize=None)
+def _cached_checker(protocol: type) -> ProtocolChecker[Any]:
+    return ProtocolChecker(protocol)
+
+
+class NoMatchingProtocol(TypeError):
+    ...
+
+
+class ProtocolDispatch(Generic[R]):
+    # handlers are tried in registration order, the chosen one is cached per class
+
+    def __init__(self) -> None:
+        self._handlers: list[tuple[ProtocolChecker[Any], Callable[[Any], R]]] = []
+        self._chosen: dict[type, tuple[ProtocolChecker[Any], Callable[[Any], R]]] = {}
+
+    def register(self, protocol: Type[P], handler: Callable[[P], R]) -> None:
+        self._handlers.append((checker_for(protocol), handler))
+        self._chosen.clear()
+
+    def __call__(self, obj: object) -> R:
+        chosen = self._chosen.get(type(obj))
+        # the checker has its own cache, this only saves walking the handlers
+        if chosen is not None and chosen[0](obj):
+            return chosen[1](obj)
+        for checker, handler in self._handlers:
+            if checker(obj):
+                self._chosen[type(obj)] = (checker, handler)
+                return handler(obj)
+        raise NoMatchingProtocol(f"no handler registered for {type(obj).__name__}")
+
+
+@runtime_checkable
+class NamedProtocol(Protocol):
+    name: str
+    last_name: str
+
+    @property
+    def full_name(self) -> str: ...
+
+
+class ParentClass:
+    name: str = "test"
+    last_name: str = "valid"
+
+    @property
+    def full_name(self) -> str:
+        return self.name + self.last_name
+
+
+class InvalidNamedClass(ParentClass):
+
+    @property
+    def full_name(self) -> int:  # type: ignore[override]
+        return 25
+
+
+# mypy doesn't let abstract classes (protocols included) be given where `Type[P]` is expected
+# https://github.com/python/mypy/issues/4717
+is_named = checker_for(NamedProtocol)  # type: ignore[type-abstract]
+
+is_named(ParentClass())  # True
+isinstance(InvalidNamedClass(), NamedProtocol)  # True, only the names are checked
+is_named(InvalidNamedClass())  # False, `full_name` is `int`
@@ -0,0 +1,114 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  `ListOfNames.get_names()` (see `1_standard.py`) calls the `full_name`   #
+#  property of every item on every call, and `ParentClass.full_name`       #
+#  concatenates the strings again each time.                               #
+#                                                                          #
+#  `CachedListOfNames` keeps the full names next to the items: a name is   #
+#  computed once in `add`, and only recomputed after the item tells us it  #
+#  was renamed. `NamedEntity` is a `ParentClass` that does tell, it also   #
+#  memoizes its own `full_name` until `name` or `last_name` change.        #
+#                                                                          #
+#  Items that can't notify renames still work, their names are just        #
+#  computed on every call as `ListOfNames` does.                           #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Generic, Iterator, Protocol, TypeVar
+
+
+class NamedProtocol(Protocol):
+    name: str
+    last_name: str
+
+    @property
+    def full_name(self) -> str: ...
+
+
+T = TypeVar("T", bound=NamedProtocol)
+
+RenameListener = Callable[[Any], None]
+
+
+@dataclass
+class NamedEntity:
+    name: str
+    last_name: str
+
+    def __setattr__(self, attribute: str, value: Any) -> None:
+        object.__setattr__(self, attribute, value)
+        if attribute in ("name", "last_name"):
+            self.__dict__.pop("full_name", None)  # forget the `cached_property` value
+            for listener in self.__dict__.get("_rename_listeners", ()):
+                listener(self)
+
+    @cached_property
+    def full_name(self) -> str:
+        return self.name + self.last_name
+
+    def add_rename_listener(self, listener: RenameListener) -> None:
+        self.__dict__.setdefault("_rename_listeners", []).append(listener)
+
+    def remove_rename_listener(self, listener: RenameListener) -> None:
+        self.__dict__.get("_rename_listeners", []).remove(listener)
+
+
+class CachedListOfNames(Generic[T]):
+    my_list: list[T]
+
+    def __init__(self) -> None:
+        self.my_list = []
+        self._names: list[str] = []
+        self._stale: set[int] = set()  # indices renamed since their name was computed
+        self._untracked: set[int] = set()  # indices of items that can't tell us about renames
+        self._indices: dict[int, list[int]] = {}  # id(item) -> where it is in `my_list`
+
+    def add(self, val: T) -> None:
+        index = len(self.my_list)
+        self.my_list.append(val)
+        self._names.append(val.full_name)
+
+        add_listener = getattr(val, "add_rename_listener", None)
+        if add_listener is None:
+            self._untracked.add(index)
+            return
+        if id(val) not in self._indices:
+            self._indices[id(val)] = []
+            add_listener(self._renamed)
+        self._indices[id(val)].append(index)
+
+    def get_at(self, index: int) -> T:
+        return self.my_list[index]
+
+    def get_names(self) -> list[str]:
+        self._refresh()
+        return self._names.copy()  # a copy, nobody outside should edit the index
+
+    def iter_names(self) -> Iterator[str]:
+        for index in range(len(self._names)):
+            if index in self._stale or index in self._untracked:
+                self._names[index] = self.my_list[index].full_name
+                self._stale.discard(index)
+            yield self._names[index]
+
+    def _renamed(self, item: Any) -> None:
+        self._stale.update(self._indices.get(id(item), ()))
+
+    def _refresh(self) -> None:
+        if self._untracked:
+            self._stale.update(self._untracked)
+        if self._stale:
+            names, items = self._names, self.my_list
+            for index in self._stale:
+                names[index] = items[index].full_name
+            self._stale.clear()
+
+
+my_list_of_names: CachedListOfNames[NamedEntity] = CachedListOfNames()
+
+my_list_of_names.add(NamedEntity(name="test", last_name="valid"))
+my_list_of_names.add(NamedEntity(name="other", last_name="valid"))
+
+my_list_of_names.get_at(0).name = "renamed"  # only this entry is computed again
+my_names = my_list_of_names.get_names()
@@ -0,0 +1,131 @@
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+#                                                                          #
+#  Most of the examples have lines that are *meant* to fail the type       #
+#  checker. Instead of reading mypy output by eye, the error code expected #
+#  on every line is stored in `expected_errors.txt` and this module checks #
+#  the whole tree with a single in-process mypy run and diffs the result:  #
+#                                                                          #
+#  `python snapshots.py`           compare mypy output with the snapshot   #
+#  `python snapshots.py --update`  record the current output as expected   #
+#                                                                          #
+#  The snapshot has one line per example file, the path followed by its    #
+#  sorted `line:code` entries, i.e.                                        #
+#                                                                          #
+#  `basics/1_2_typed_dict.py 10:typeddict-item 11:typeddict-unknown-key`   #
+#                                                                          #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #  #
+import argparse
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from mypy import api
+
+from main import CACHE_DIR, ROOT, discover_examples
+
+SNAPSHOT_FILE = ROOT / "expected_errors.txt"
+
+# path:line: error: message  [code]
+ERROR_LINE = re.compile(r"^(?P<path>[^:]+):(?P<line>\d+): error: .*?(?:\s+\[(?P<code>[\w-]+)\])?$")
+
+Diagnostic = tuple[int, str]
+Snapshot = dict[str, list[Diagnostic]]
+
+
+def collect_diagnostics(paths: Sequence[Path], cache_dir: Path = CACHE_DIR) -> Snapshot:
+    # one type checker invocation for the whole tree, no matter how many files there are
+    stdout, stderr, status = api.run([
+        "--cache-dir", str(cache_dir),
+        "--show-error-codes",
+        "--hide-error-context",
+        "--no-error-summary",
+        "--no-pretty",
+        *(str(path.relative_to(ROOT)) for path in paths),
+    ])
+    if status == 2:
+        raise RuntimeError(f"mypy could not check the examples:\n{stdout}{stderr}")
+
+    diagnostics: Snapshot = defaultdict(list)
+    for path in paths:
+        diagnostics[path.relative_to(ROOT).as_posix()] = []
+    for line in stdout.splitlines():
+        match = ERROR_LINE.match(line)
+        if match is None:
+            continue
+        diagnostics[Path(match["path"]).as_posix()].append((int(match["line"]), match["code"] or "unknown"))
+
+    return {path: sorted(entries) for path, entries in sorted(diagnostics.items())}
+
+
+def dump_snapshot(snapshot: Snapshot) -> str:
+    return "".join(
+        " ".join([path, *(f"{line}:{code}" for line, code in entries)]) + "\n"
+        for path, entries in sorted(snapshot.items())
+    )
+
+
+def parse_snapshot(text: str) -> Snapshot:
+    snapshot: Snapshot = {}
+    for row in text.splitlines():
+        if not row.strip():
+            continue
+        path, *entries = row.split()
+        snapshot[path] = sorted((int(line), code) for line, code in (entry.split(":", 1) for entry in entries))
+    return snapshot
+
+
+def load_snapshot(snapshot_file: Path = SNAPSHOT_FILE) -> Snapshot:
+    try:
+        return parse_snapshot(snapshot_file.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def diff_snapshots(expected: Snapshot, actual: Snapshot) -> list[str]:
+    differences: list[str] = []
+    for path in sorted(expected.keys() | actual.keys()):
+        # a line can expect the same code more than once (i.e. two bad list items)
+        wanted = _count(expected.get(path, []))
+        got = _count(actual.get(path, []))
+        for (line, code), times in sorted(wanted.items()):
+            for _ in range(times - got.get((line, code), 0)):
+                differences.append(f"{path}:{line}: missing expected error [{code}]")
+        for (line, code), times in sorted(got.items()):
+            for _ in range(times - wanted.get((line, code), 0)):
+                differences.append(f"{path}:{line}: unexpected error [{code}]")
+    return differences
+
+
+def _count(entries: Iterable[Diagnostic]) -> dict[Diagnostic, int]:
+    counter: dict[Diagnostic, int] = defaultdict(int)
+    for entry in entries:
+        counter[entry] += 1
+    return counter
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify the intentional type errors of the examples.")
+    parser.add_argument("--update", action="store_true", help="record the current mypy output as expected")
+    args = parser.parse_args(argv)
+
+    actual = collect_diagnostics(discover_examples())
+    if args.update:
+        SNAPSHOT_FILE.write_text(dump_snapshot(actual))
+        print(f"recorded {sum(map(len, actual.values()))} expected errors in {len(actual)} files")
+        return 0
+
+    differences = diff_snapshots(load_snapshot(), actual)
+    for difference in differences:
+        print(difference)
+    if differences:
+        print(f"\n{len(differences)} differences, run `python snapshots.py --update` if they are intended")
+        return 1
+
+    print(f"{sum(map(len, actual.values()))} expected errors verified in {len(actual)} files")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())